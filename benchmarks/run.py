@@ -0,0 +1,342 @@
+import argparse
+import base64
+import datetime as _dt
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Headless and isolated: set before Qt or qt_worklog are imported.
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+_TMP = tempfile.TemporaryDirectory(prefix="worklog-bench-")
+os.environ["XDG_DATA_HOME"] = os.path.join(_TMP.name, "data")
+os.environ["XDG_CACHE_HOME"] = os.path.join(_TMP.name, "cache")
+
+from .synthetic import SPREADS, densest_month, generate_worklogs  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_REPEAT = 5
+# Widgets built for the layout and card benchmarks, whatever the data size.
+MAX_CARDS = 400
+# A result regresses when its median grows by more than this fraction...
+DEFAULT_THRESHOLD = 0.25
+# ...and by more than this many milliseconds, to ignore timer noise.
+DEFAULT_MIN_DELTA_MS = 1.0
+
+
+class Recorder:
+    """Times callables and collects machine-readable results."""
+
+    def __init__(self, repeat: int):
+        self.repeat = repeat
+        self.results: List[Dict[str, Any]] = []
+
+    def measure(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        *,
+        size: int,
+        spread: str,
+        setup: Optional[Callable[[], Any]] = None,
+        items: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        samples = []
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        result = {
+            "name": name,
+            "size": size,
+            "spread": spread,
+            "items": items if items is not None else size,
+            "repeat": len(samples),
+            "min_ms": samples[0],
+            "median_ms": statistics.median(samples),
+            "mean_ms": statistics.fmean(samples),
+            "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        }
+        self.results.append(result)
+        print(
+            f"{name:<28} {size:>7} {spread:<7} median {result['median_ms']:9.2f} ms"
+            f"  min {result['min_ms']:9.2f} ms",
+            file=sys.stderr,
+        )
+        return result
+
+    def skip(self, name: str, *, size: int, spread: str, reason: str) -> None:
+        self.results.append({"name": name, "size": size, "spread": spread, "skipped": reason})
+        print(f"{name:<28} {size:>7} {spread:<7} skipped: {reason}", file=sys.stderr)
+
+
+def _fake_token() -> str:
+    def part(obj):
+        return base64.urlsafe_b64encode(json.dumps(obj).encode()).decode().rstrip("=")
+
+    return f"{part({'alg': 'none'})}.{part({'user_id': 'bench', 'exp': 4102444800})}.sig"
+
+
+def _make_token_manager():
+    from PySide6.QtCore import QObject, Signal
+
+    class BenchTokenManager(QObject):
+        """Never signed in, so the window stays offline and deterministic."""
+
+        ready = Signal()
+        login_required = Signal()
+
+        def is_ready(self) -> bool:
+            return False
+
+        def get_token(self):
+            return None
+
+        def sign_out(self) -> None:
+            pass
+
+    return BenchTokenManager()
+
+
+def bench_window(rec: Recorder, app, logs, *, size: int, spread: str) -> None:
+    from qt_worklog.services.local_store import get_store
+    from qt_worklog.ui.main_window import MainWindow
+
+    store = get_store()
+    store.clear()
+    store.upsert_worklogs(logs)
+
+    window = MainWindow(_make_token_manager())
+    window.resize(1280, 900)
+    window.show()
+    app.processEvents()
+
+    def settle():
+        app.processEvents()
+        window._prefetch_timer.stop()
+
+    rec.measure(
+        "get_newest_month", window._get_newest_month, size=size, spread=spread
+    )
+
+    month = densest_month(logs)
+    window._current_month = month
+    rec.measure(
+        "build_grid_cold",
+        lambda: (window._build_grid(), settle()),
+        setup=lambda: window._index.drop_month(month.year, month.month),
+        size=size,
+        spread=spread,
+    )
+    rec.measure(
+        "build_grid_warm", lambda: (window._build_grid(), settle()), size=size, spread=spread
+    )
+
+    def shift():
+        window._shift_month(-1)
+        settle()
+        window._shift_month(1)
+        settle()
+
+    rec.measure("shift_month_pair", shift, size=size, spread=spread)
+
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+
+
+def bench_widgets(rec: Recorder, app, logs, *, size: int, spread: str) -> None:
+    from PySide6.QtCore import QRect
+    from PySide6.QtWidgets import QWidget
+
+    from qt_worklog.ui.flow_layout import FlowLayout
+    from qt_worklog.ui.worklog_card import WorklogCard
+
+    sample = logs[:MAX_CARDS]
+    built: List[WorklogCard] = []
+
+    def discard():
+        for card in built:
+            card.deleteLater()
+        built.clear()
+        app.processEvents()
+
+    rec.measure(
+        "worklog_card_construct",
+        lambda: built.extend(WorklogCard(rec) for rec in sample),
+        setup=discard,
+        size=size,
+        spread=spread,
+        items=len(sample),
+    )
+    discard()
+
+    container = QWidget()
+    layout = FlowLayout(container, 10, 10)
+    for rec_ in sample:
+        layout.addWidget(WorklogCard(rec_))
+    container.resize(1200, 800)
+    rect = QRect(0, 0, 1200, 0)
+
+    rec.measure(
+        "flow_layout_do_layout",
+        lambda: layout._do_layout(rect, False),
+        size=size,
+        spread=spread,
+        items=len(sample),
+    )
+    rec.measure(
+        "flow_layout_height_for_width",
+        lambda: layout.heightForWidth(1200),
+        setup=layout.invalidate,
+        size=size,
+        spread=spread,
+        items=len(sample),
+    )
+    container.deleteLater()
+    app.processEvents()
+
+
+def bench_http(rec: Recorder, logs, *, size: int, spread: str) -> None:
+    names = ["get_worklogs_200", "stream_worklog_page_200", "get_worklogs_304"]
+    if importlib.util.find_spec("requests") is None:
+        for name in names:
+            rec.skip(name, size=size, spread=spread, reason="requests is not installed")
+        return
+
+    from qt_worklog.services import api_client
+    from .stub_server import StubApiServer
+
+    token = _fake_token()
+    with StubApiServer(logs) as server:
+        api_client.API_URL = server.url
+        rec.measure(
+            "get_worklogs_200",
+            lambda: api_client.get_worklogs(token, limit=size),
+            size=size,
+            spread=spread,
+        )
+        rec.measure(
+            "stream_worklog_page_200",
+            lambda: sum(len(b) for b in api_client.stream_worklog_page(token, limit=size)),
+            size=size,
+            spread=spread,
+        )
+        server.set_worklogs(logs, etag=True)
+        api_client.get_worklogs(token, limit=size)
+        rec.measure(
+            "get_worklogs_304",
+            lambda: api_client.get_worklogs(token, limit=size),
+            size=size,
+            spread=spread,
+        )
+
+
+def compare(results, baseline, *, threshold: float, min_delta_ms: float) -> List[str]:
+    """Return a message for every result slower than ``baseline`` allows."""
+    base = {
+        (r["name"], r["size"], r["spread"]): r
+        for r in baseline.get("results", [])
+        if "median_ms" in r
+    }
+    regressions = []
+    for r in results:
+        old = base.get((r["name"], r["size"], r["spread"]))
+        if old is None or "median_ms" not in r:
+            continue
+        delta = r["median_ms"] - old["median_ms"]
+        if delta > min_delta_ms and r["median_ms"] > old["median_ms"] * (1 + threshold):
+            regressions.append(
+                f"{r['name']} size={r['size']} spread={r['spread']}: "
+                f"{old['median_ms']:.2f} ms -> {r['median_ms']:.2f} ms "
+                f"(+{delta / old['median_ms'] * 100:.0f}%)"
+            )
+    return regressions
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Time the worklog data and rendering hot paths headlessly.",
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="comma-separated log counts (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--spreads",
+        default="year",
+        help=f"comma-separated date spreads out of {', '.join(SPREADS)} (default: %(default)s)",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", help="write JSON results here instead of stdout")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    spreads = [s for s in args.spreads.split(",") if s]
+    for spread in spreads:
+        if spread not in SPREADS:
+            raise SystemExit(f"Unknown spread {spread!r}; choose from {', '.join(SPREADS)}")
+
+    from PySide6 import __version__ as pyside_version
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    rec = Recorder(args.repeat)
+    for size in sizes:
+        for spread in spreads:
+            logs = generate_worklogs(size, spread=spread, seed=args.seed)
+            bench_window(rec, app, logs, size=size, spread=spread)
+            bench_widgets(rec, app, logs, size=size, spread=spread)
+            bench_http(rec, logs, size=size, spread=spread)
+
+    report = {
+        "meta": {
+            "timestamp": _dt.datetime.now(_dt.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "pyside": pyside_version,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": rec.results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(
+            rec.results, baseline, threshold=args.threshold, min_delta_ms=args.min_delta_ms
+        )
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions against the baseline.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+
+class StubApiServer:
+    """Local HTTP server answering ``GET /api/worklogs`` with a fixed body.
+
+    With ``etag`` enabled it honours ``If-None-Match`` and answers 304, so
+    the conditional-request path of the client can be timed as well.
+    """
+
+    def __init__(self, worklogs: Any = (), *, etag: bool = False):
+        self.etag: Optional[str] = None
+        self.requests = 0
+        self.set_worklogs(worklogs, etag=etag)
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.requests += 1
+                path = urlsplit(self.path).path.rstrip("/")
+                if path.endswith("/worklogs"):
+                    body = server.body
+                elif path.endswith("/tags"):
+                    body = b"[]"
+                else:
+                    self.send_error(404)
+                    return
+                if server.etag and self.headers.get("If-None-Match") == server.etag:
+                    self.send_response(304)
+                    self.send_header("ETag", server.etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if server.etag:
+                    self.send_header("ETag", server.etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def set_worklogs(self, worklogs: Any, *, etag: bool = False) -> None:
+        self.body = json.dumps(list(worklogs)).encode("utf-8")
+        self.etag = f'"{hashlib.sha1(self.body).hexdigest()}"' if etag else None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def __enter__(self) -> "StubApiServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
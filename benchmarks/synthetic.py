@@ -0,0 +1,81 @@
+import datetime as _dt
+import random
+from typing import Any, Dict, List, Optional
+
+# Span of record dates, in days, for each named spread.
+SPREADS = {
+    "month": 28,
+    "year": 365,
+    "decade": 3650,
+}
+
+# (weight, min chars, max chars): mostly one-liners, some notes, a few essays.
+CONTENT_LENGTHS = [
+    (0.6, 5, 80),
+    (0.3, 80, 600),
+    (0.1, 600, 4000),
+]
+
+_WORDS = (
+    "review deploy fix meeting write tests refactor design sync standup "
+    "investigate bug release docs onboarding benchmark profile cache layout "
+    "修复 会议 設計 テスト 리뷰 배포"
+).split()
+
+
+def _content(rng: random.Random, length: int) -> str:
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        size += len(word) + 1
+    if rng.random() < 0.1:
+        words.insert(rng.randrange(len(words)), "\n")
+    return " ".join(words)[:length]
+
+
+def generate_worklogs(
+    count: int,
+    *,
+    spread: str = "year",
+    seed: int = 0,
+    end: Optional[_dt.date] = None,
+    tags: int = 12,
+    spaces: int = 3,
+) -> List[Dict[str, Any]]:
+    """Return ``count`` deterministic worklog records ending on ``end``.
+
+    Dates are uniform over the ``spread`` window, so "month" piles every
+    log into one month and "decade" leaves most months sparse.
+    """
+    rng = random.Random(seed)
+    end = end or _dt.date.today()
+    days = SPREADS[spread]
+    weights = [w for w, _, _ in CONTENT_LENGTHS]
+    logs = []
+    for i in range(count):
+        day = end - _dt.timedelta(days=rng.randrange(days))
+        at = _dt.datetime.combine(day, _dt.time(rng.randrange(24), rng.randrange(60)))
+        _, low, high = rng.choices(CONTENT_LENGTHS, weights)[0]
+        logs.append(
+            {
+                "id": f"bench-{seed}-{i}",
+                "space_id": f"space-{rng.randrange(spaces)}",
+                "record_time": at.isoformat() + "Z",
+                "updated_at": at.isoformat() + "Z",
+                "created_at": at.isoformat() + "Z",
+                "content": _content(rng, rng.randint(low, high)),
+                "tag_ids": rng.sample([f"tag-{t}" for t in range(tags)], rng.randint(0, 3)),
+            }
+        )
+    return logs
+
+
+def densest_month(logs: List[Dict[str, Any]]) -> _dt.date:
+    counts: Dict[str, int] = {}
+    for rec in logs:
+        key = rec["record_time"][:7]
+        counts[key] = counts.get(key, 0) + 1
+    year, month = max(counts, key=counts.__getitem__).split("-")
+    return _dt.date(int(year), int(month), 1)
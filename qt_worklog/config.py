@@ -3,8 +3,6 @@ import json
 from pathlib import Path
 import sys
 
-from PySide6.QtWidgets import QMessageBox
-
 
 class ConfigError(Exception):
     pass
@@ -14,6 +12,21 @@ def get_config_dir() -> Path:
     return Path.home() / ".config" / "worklog"
 
 
+def get_data_dir() -> Path:
+    base = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(base) / "worklog"
+
+
+def get_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "worklog"
+
+
+def get_state_dir() -> Path:
+    base = os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state"
+    return Path(base) / "worklog"
+
+
 def load_config(filename: str, env_prefix: str) -> dict:
     config_dir = get_config_dir()
     config_file = config_dir / filename
@@ -34,6 +47,9 @@ def load_config(filename: str, env_prefix: str) -> dict:
 
 
 def handle_config_error(app, e: ConfigError):
+    # Imported here so that logging can use the directory helpers before Qt loads.
+    from PySide6.QtWidgets import QMessageBox
+
     msg_box = QMessageBox()
     msg_box.setIcon(QMessageBox.Critical)
     msg_box.setText(str(e))
@@ -1,13 +1,158 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+from typing import Dict, List, Optional
 
+from . import config
 
-def setup_logging():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler("worklog.log"),
-        ],
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+# Size-based rotation: bytes per file and rotated files kept.
+MAX_LOG_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 5
+
+# Short names accepted in WORKLOG_LOG_LEVELS and ``module_levels``.
+MODULE_ALIASES = {
+    "api_client": "qt_worklog.services.api_client",
+    "auth": "qt_worklog.services.auth",
+    "ui": "qt_worklog.ui",
+}
+
+logger = logging.getLogger(__name__)
+
+_EXC_FORMATTER = logging.Formatter()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Keeps the traceback apart from the message for the formatters."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    """Parse ``"api_client=DEBUG,auth=WARNING"`` into a name -> level map."""
+    levels = {}
+    for item in spec.split(","):
+        name, sep, level = item.partition("=")
+        if sep and name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _checked_level(level: str, what: str, problems: List[str]) -> Optional[int]:
+    """Return the number for ``level``, noting a problem if it is unknown."""
+    value = logging.getLevelNamesMapping().get(level.strip().upper())
+    if not isinstance(value, int):
+        problems.append(f"Unknown log level {level!r} for {what}")
+        return None
+    return value
+
+
+def _file_handler(path, rotate_when: Optional[str]) -> logging.Handler:
+    if rotate_when:
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=rotate_when, backupCount=BACKUP_COUNT, encoding="utf-8", delay=True
+        )
+    return logging.handlers.RotatingFileHandler(
+        path, maxBytes=MAX_LOG_BYTES, backupCount=BACKUP_COUNT, encoding="utf-8", delay=True
     )
+
+
+def setup_logging(
+    level: Optional[str] = None,
+    module_levels: Optional[Dict[str, str]] = None,
+    json_lines: Optional[bool] = None,
+    rotate_when: Optional[str] = None,
+) -> None:
+    """Route logging through a queue to handlers on a background thread.
+
+    Emitting a record only enqueues it, so the GUI thread never waits on
+    the console or the disk. The log file lives in the XDG state directory
+    and rotates by size, or by time when ``rotate_when`` (a
+    :class:`~logging.handlers.TimedRotatingFileHandler` ``when``) is set.
+
+    Arguments left as ``None`` come from the environment:
+    ``WORKLOG_LOG_LEVEL``, ``WORKLOG_LOG_LEVELS`` (e.g.
+    ``api_client=DEBUG,auth=WARNING``), ``WORKLOG_LOG_JSON`` and
+    ``WORKLOG_LOG_ROTATE``.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    if level is None:
+        level = os.environ.get("WORKLOG_LOG_LEVEL", "INFO").upper()
+    if module_levels is None:
+        module_levels = _parse_levels(os.environ.get("WORKLOG_LOG_LEVELS", ""))
+    if json_lines is None:
+        json_lines = os.environ.get("WORKLOG_LOG_JSON", "") not in ("", "0", "false")
+    if rotate_when is None:
+        rotate_when = os.environ.get("WORKLOG_LOG_ROTATE") or None
+
+    log_dir = config.get_state_dir()
+    log_dir.mkdir(parents=True, exist_ok=True)
+    file_handler = _file_handler(log_dir / "worklog.log", rotate_when)
+    file_handler.setFormatter(JsonLinesFormatter() if json_lines else logging.Formatter(LOG_FORMAT))
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    # A typo in a diagnostics setting must not stop the app from starting.
+    problems: List[str] = []
+    root_level = _checked_level(level, "the root logger", problems)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(logging.INFO if root_level is None else root_level)
+    root.addHandler(_QueueHandler(log_queue))
+    for name, module_level in module_levels.items():
+        value = _checked_level(module_level, name, problems)
+        if value is not None:
+            logging.getLogger(MODULE_ALIASES.get(name, name)).setLevel(value)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(shutdown_logging)
+    for problem in problems:
+        logger.warning("%s; using the default instead.", problem)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
@@ -1,55 +1,97 @@
+import os
 import sys
 
-from PySide6.QtWidgets import QApplication
-
-from . import config
-from .ui.login_window import LoginWindow
-from .services.auth.token_manager import TokenManager
-from .ui.main_window import MainWindow
 from .logging_config import setup_logging
+from .startup_profile import StartupProfile
 
 
-import os
-
 def main():
-    setup_logging()
-    app = QApplication(sys.argv)
+    # Everything heavier than the profiler is imported inside a phase so
+    # that ``--profile-startup`` can attribute its cost.
+    profile = StartupProfile("--profile-startup" in sys.argv)
+    argv = [arg for arg in sys.argv if arg != "--profile-startup"]
+
+    with profile.phase("logging"):
+        setup_logging()
+    with profile.phase("import Qt"):
+        from PySide6.QtWidgets import QApplication
+        from . import config
+    with profile.phase("QApplication"):
+        app = QApplication(argv)
+
+    with profile.phase("watchdog"):
+        from .watchdog import StallWatchdog
+
+        watchdog = StallWatchdog(app)
+        watchdog.start()
+        app.aboutToQuit.connect(watchdog.stop)
 
     # Load stylesheet
-    style_path = os.path.join(os.path.dirname(__file__), "ui", "style.qss")
-    with open(style_path, "r") as f:
-        app.setStyleSheet(f.read())
+    with profile.phase("stylesheet"):
+        style_path = os.path.join(os.path.dirname(__file__), "ui", "style.qss")
+        with open(style_path, "r") as f:
+            app.setStyleSheet(f.read())
 
-    try:
-        config.load_all_configs()
-    except config.ConfigError as e:
-        config.handle_config_error(app, e)
-        return
+    with profile.phase("config"):
+        try:
+            config.load_all_configs()
+        except config.ConfigError as e:
+            config.handle_config_error(app, e)
+            return
 
-    token_manager = TokenManager()
+    with profile.phase("token manager"):
+        from .services.auth.token_manager import TokenManager
+
+        token_manager = TokenManager()
+
+    with profile.phase("local cache"):
+        from .services.session import has_session_data
+
+        # Local data is tied to its user and wiped whenever the credentials
+        # go away, so owned data means a session is still signed in: paint
+        # from it while the credentials load.
+        has_cache = has_session_data()
 
     # These references are kept to prevent the windows from being garbage collected
     global main_window, login_window
+    main_window = None
+    login_window = None
 
     def show_main():
         global main_window
-        main_window = MainWindow(token_manager)
-        main_window.show()
-        if 'login_window' in globals():
+        with profile.phase("import main window"):
+            from .ui.main_window import MainWindow
+        with profile.phase("main window"):
+            main_window = MainWindow(token_manager)
+            main_window.show()
+        profile.watch_first_paint(main_window)
+        # A fresh login stores new credentials; time the refresh from them.
+        if token_manager.is_ready():
+            token_manager.schedule_refresh()
+        if login_window is not None:
             login_window.close()
 
     def show_login():
         global login_window
+        with profile.phase("import login window"):
+            from .ui.login_window import LoginWindow
         login_window = LoginWindow(token_manager)
         login_window.login_successful.connect(show_main)
         login_window.show()
+        profile.watch_first_paint(login_window)
+        if main_window is not None:
+            main_window.close()
+
+    def on_ready():
+        if main_window is None:
+            show_main()
 
     token_manager.login_required.connect(show_login)
+    token_manager.ready.connect(on_ready)
 
-    if token_manager.get_token():
+    if has_cache:
         show_main()
-    else:
-        show_login()
+    token_manager.load()
 
     sys.exit(app.exec())
 
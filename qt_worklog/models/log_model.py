@@ -0,0 +1,71 @@
+import datetime as _dt
+from typing import Any, List, Mapping, Sequence, Tuple
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QPersistentModelIndex, Qt
+
+from .worklog_index import IndexedLog
+
+
+class LogModel(QAbstractListModel):
+    """Flat list model of one month: a header row per day, then its logs.
+
+    The web client's ``store-logs.js`` maps onto this model (SPEC §10).
+    """
+
+    HEADER = 0
+    LOG = 1
+
+    KindRole = Qt.UserRole + 1
+    RecordRole = Qt.UserRole + 2
+    DateRole = Qt.UserRole + 3
+    KeyRole = Qt.UserRole + 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # (kind, date, record or None)
+        self._rows: List[Tuple[int, _dt.date, Mapping[str, Any] | None]] = []
+
+    def set_groups(self, groups: Mapping[_dt.date, Sequence[IndexedLog]]) -> None:
+        """Replace the contents with day-grouped entries, newest day first."""
+        rows: List[Tuple[int, _dt.date, Mapping[str, Any] | None]] = []
+        for d in sorted(groups.keys(), reverse=True):
+            entries = groups[d]
+            if not entries:
+                continue
+            rows.append((self.HEADER, d, None))
+            rows.extend((self.LOG, d, entry.record) for entry in entries)
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        kind, d, record = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            if kind == self.HEADER:
+                return d.strftime("%A, %B %d, %Y")
+            return record.get("content", "No content")
+        if role == self.KindRole:
+            return kind
+        if role == self.RecordRole:
+            return record
+        if role == self.DateRole:
+            return d
+        if role == self.KeyRole:
+            if kind == self.HEADER:
+                return f"day:{d.isoformat()}"
+            return f"log:{record.get('id')}"
+        return None
+
+    def flags(self, index: QModelIndex | QPersistentModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if self._rows[index.row()][0] == self.HEADER:
+            return Qt.ItemIsEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
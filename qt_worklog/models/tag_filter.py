@@ -0,0 +1,156 @@
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
+
+
+def record_tag_ids(record: Mapping[str, Any]) -> List[str]:
+    """Return the tag ids of a worklog, whichever shape the API used."""
+    tags = record.get("tag_ids")
+    if tags is None:
+        tags = record.get("tags")
+    if tags is None:
+        tag_id = record.get("tag_id")
+        tags = [tag_id] if tag_id else []
+    ids = []
+    for tag in tags or []:
+        if isinstance(tag, Mapping):
+            tag = tag.get("id")
+        if tag is not None:
+            ids.append(str(tag))
+    return ids
+
+
+class TagBitmapIndex:
+    """Per-tag bitmaps over the loaded worklogs.
+
+    Every worklog owns one bit position; each tag keeps a Python ``int``
+    whose set bits are the worklogs carrying it. Include/exclude filters
+    and intersections with the month or search results then become
+    bitwise AND/OR/NOT on those ints.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._slot: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._tags: Dict[str, int] = {}
+        self._doc_tags: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def tag_ids(self) -> List[str]:
+        with self._lock:
+            return [tag for tag, bits in self._tags.items() if bits]
+
+    def add(self, logs: Iterable[Mapping[str, Any]]) -> None:
+        with self._lock:
+            for rec in logs:
+                self._add(rec)
+
+    def _add(self, rec: Mapping[str, Any]) -> int:
+        doc_id = str(rec.get("id"))
+        self._remove(doc_id)
+        if self._free:
+            pos = self._free.pop()
+            self._ids[pos] = doc_id
+        else:
+            pos = len(self._ids)
+            self._ids.append(doc_id)
+        self._slot[doc_id] = pos
+        bit = 1 << pos
+        tags = record_tag_ids(rec)
+        self._doc_tags[doc_id] = tags
+        for tag in tags:
+            self._tags[tag] = self._tags.get(tag, 0) | bit
+        return pos
+
+    def remove(self, ids: Iterable[str]) -> None:
+        with self._lock:
+            for doc_id in ids:
+                self._remove(str(doc_id))
+
+    def _remove(self, doc_id: str) -> None:
+        pos = self._slot.pop(doc_id, None)
+        if pos is None:
+            return
+        mask = ~(1 << pos)
+        for tag in self._doc_tags.pop(doc_id, ()):
+            self._tags[tag] &= mask
+        self._ids[pos] = None
+        self._free.append(pos)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slot.clear()
+            self._ids = []
+            self._free = []
+            self._tags.clear()
+            self._doc_tags.clear()
+
+    def bits_for_records(self, records: Iterable[Mapping[str, Any]]) -> int:
+        """Bitmap of ``records``, indexing any that are not known yet."""
+        bits = 0
+        with self._lock:
+            for rec in records:
+                pos = self._slot.get(str(rec.get("id")))
+                if pos is None:
+                    pos = self._add(rec)
+                bits |= 1 << pos
+        return bits
+
+    def bits_for_ids(self, ids: Iterable[str]) -> int:
+        bits = 0
+        with self._lock:
+            for doc_id in ids:
+                pos = self._slot.get(str(doc_id))
+                if pos is not None:
+                    bits |= 1 << pos
+        return bits
+
+    def filter_bits(
+        self,
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        *,
+        match_all: bool = False,
+        within: Optional[int] = None,
+    ) -> int:
+        """Bitmap of worklogs passing the tag filter, optionally within a set.
+
+        ``include`` keeps logs carrying any (or, with ``match_all``, every)
+        listed tag; ``exclude`` drops logs carrying any listed tag.
+        """
+        with self._lock:
+            bits = within if within is not None else (1 << len(self._ids)) - 1
+            include = list(include)
+            if include:
+                if match_all:
+                    for tag in include:
+                        bits &= self._tags.get(tag, 0)
+                else:
+                    any_bits = 0
+                    for tag in include:
+                        any_bits |= self._tags.get(tag, 0)
+                    bits &= any_bits
+            for tag in exclude:
+                bits &= ~self._tags.get(tag, 0)
+        return bits
+
+    def ids_for_bits(self, bits: int) -> Set[str]:
+        result: Set[str] = set()
+        with self._lock:
+            while bits:
+                low = bits & -bits
+                doc_id = self._ids[low.bit_length() - 1]
+                if doc_id is not None:
+                    result.add(doc_id)
+                bits ^= low
+        return result
+
+
+_index = TagBitmapIndex()
+
+
+def get_tag_index() -> TagBitmapIndex:
+    return _index
@@ -0,0 +1,202 @@
+import datetime as _dt
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+MonthKey = Tuple[int, int]
+
+# Rough per-record footprint (dict, IndexedLog, list slot) on top of content.
+_RECORD_OVERHEAD_BYTES = 1024
+
+
+def parse_record_date(value: Any) -> Optional[_dt.date]:
+    """Return the calendar date of a ``record_time`` value, or ``None``."""
+    if not value:
+        return None
+    s = str(value)
+    try:
+        return _dt.datetime.fromisoformat(s.replace("Z", "+00:00")).date()
+    except ValueError:
+        try:
+            return _dt.date.fromisoformat(s[:10])
+        except ValueError:
+            return None
+
+
+class IndexedLog:
+    """A worklog record with its parsed date kept alongside."""
+
+    __slots__ = ("id", "date", "record")
+
+    def __init__(self, record: Mapping[str, Any], date: _dt.date):
+        self.id = str(record.get("id"))
+        self.date = date
+        self.record = record
+
+    @property
+    def size(self) -> int:
+        """Approximate memory held by this entry, in bytes."""
+        return _RECORD_OVERHEAD_BYTES + len(str(self.record.get("content") or ""))
+
+
+def index_entries(logs: Iterable[Mapping[str, Any]]) -> List[IndexedLog]:
+    """Parse records into entries; safe to call off the GUI thread."""
+    return [
+        IndexedLog(rec, parse_record_date(rec.get("record_time")) or _dt.date.today())
+        for rec in logs
+    ]
+
+
+class WorklogIndex:
+    """Worklogs bucketed as (year, month) → day → records.
+
+    Records are parsed once when added, so month lookups, day grouping and
+    the newest-month query no longer touch ``record_time`` strings.
+
+    With ``max_bytes`` set, loaded months form an LRU: reading a month marks
+    it used, and loading one evicts the least recently used unpinned months
+    until the estimated size fits again.
+    """
+
+    def __init__(self, logs: Iterable[Mapping[str, Any]] = (), max_bytes: Optional[int] = None):
+        self._months: "OrderedDict[MonthKey, Dict[_dt.date, List[IndexedLog]]]" = OrderedDict()
+        self._month_bytes: Dict[MonthKey, int] = {}
+        self._by_id: Dict[str, IndexedLog] = {}
+        self._pinned: set[MonthKey] = set()
+        self.max_bytes = max_bytes
+        self.min_date: Optional[_dt.date] = None
+        self.max_date: Optional[_dt.date] = None
+        self.add(logs)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @property
+    def size(self) -> int:
+        """Estimated bytes held by all loaded months."""
+        return sum(self._month_bytes.values())
+
+    def add(self, logs: Iterable[Mapping[str, Any]]) -> None:
+        """Insert or replace records, keyed by worklog id."""
+        self._add_entries(index_entries(logs))
+
+    def _add_entries(self, entries: Iterable[IndexedLog]) -> None:
+        for entry in entries:
+            self._discard(entry.id)
+            self._by_id[entry.id] = entry
+            key = (entry.date.year, entry.date.month)
+            self._months.setdefault(key, {}).setdefault(entry.date, []).append(entry)
+            self._month_bytes[key] = self._month_bytes.get(key, 0) + entry.size
+            if self.min_date is None or entry.date < self.min_date:
+                self.min_date = entry.date
+            if self.max_date is None or entry.date > self.max_date:
+                self.max_date = entry.date
+
+    def remove(self, ids: Iterable[str]) -> None:
+        removed = False
+        for worklog_id in ids:
+            removed |= self._discard(str(worklog_id))
+        if removed:
+            self._recompute_bounds()
+
+    def _discard(self, worklog_id: str) -> bool:
+        entry = self._by_id.pop(worklog_id, None)
+        if entry is None:
+            return False
+        key = (entry.date.year, entry.date.month)
+        days = self._months[key]
+        day = days[entry.date]
+        day.remove(entry)
+        if not day:
+            del days[entry.date]
+        self._month_bytes[key] -= entry.size
+        return True
+
+    def _recompute_bounds(self) -> None:
+        dates = [d for days in self._months.values() for d in days]
+        self.min_date = min(dates, default=None)
+        self.max_date = max(dates, default=None)
+
+    def apply_changes(
+        self, changed: Iterable[Mapping[str, Any]], deleted_ids: Iterable[str]
+    ) -> set[MonthKey]:
+        """Merge a sync delta into loaded months; return the months touched.
+
+        Changes that land in a month that is not loaded are skipped; that
+        month is read from the store in full when it is first shown.
+        """
+        touched: set[MonthKey] = set()
+        ids = [str(i) for i in deleted_ids]
+        for worklog_id in ids:
+            entry = self._by_id.get(worklog_id)
+            if entry is not None:
+                touched.add((entry.date.year, entry.date.month))
+        self.remove(ids)
+        for rec in changed:
+            old = self._by_id.get(str(rec.get("id")))
+            if old is not None:
+                touched.add((old.date.year, old.date.month))
+            d = parse_record_date(rec.get("record_time")) or _dt.date.today()
+            if self.has_month(d.year, d.month):
+                self.add([rec])
+                touched.add((d.year, d.month))
+            elif old is not None:
+                self.remove([old.id])
+        return touched
+
+    def has_month(self, year: int, month: int) -> bool:
+        return (year, month) in self._months
+
+    def replace_month(self, year: int, month: int, logs: Iterable[Mapping[str, Any]]) -> None:
+        """Replace the bucket for one month with ``logs``."""
+        self.install_month(year, month, index_entries(logs))
+
+    def install_month(self, year: int, month: int, entries: Iterable[IndexedLog]) -> None:
+        """Replace one month with entries parsed by :func:`index_entries`."""
+        self.drop_month(year, month)
+        self._months[(year, month)] = {}
+        self._month_bytes[(year, month)] = 0
+        self._add_entries(entries)
+        self._evict()
+
+    def drop_month(self, year: int, month: int) -> None:
+        days = self._months.pop((year, month), None)
+        self._month_bytes.pop((year, month), None)
+        if days is None:
+            return
+        for entries in days.values():
+            for entry in entries:
+                self._by_id.pop(entry.id, None)
+        self._recompute_bounds()
+
+    def set_pinned(self, keys: Iterable[MonthKey]) -> None:
+        """Months never evicted, e.g. the visible one and its neighbours."""
+        self._pinned = set(keys)
+        self._evict()
+
+    def loaded_months(self) -> List[MonthKey]:
+        """Loaded months, least recently used first."""
+        return list(self._months)
+
+    def _evict(self) -> None:
+        if self.max_bytes is None:
+            return
+        for key in list(self._months):
+            if self.size <= self.max_bytes:
+                break
+            if key not in self._pinned:
+                self.drop_month(*key)
+
+    def month(self, year: int, month: int) -> Dict[_dt.date, List[IndexedLog]]:
+        """Return day → records for a month; empty if not loaded."""
+        key = (year, month)
+        if key not in self._months:
+            return {}
+        self._months.move_to_end(key)
+        return self._months[key]
+
+    def get(self, worklog_id: str) -> Optional[IndexedLog]:
+        return self._by_id.get(str(worklog_id))
+
+    def newest_month(self) -> _dt.date:
+        """First day of the month holding the newest record, or of today."""
+        return (self.max_date or _dt.date.today()).replace(day=1)
@@ -1,31 +1,303 @@
-import base64
-import json
-import requests
-from typing import Any, Callable, Dict, Optional
+import datetime as _dt
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
 
+from .. import tracing
 from ..config import FIREBASE_CONFIG
+from .auth.tokens import decode_claims, token_user_id
+from .http_cache import ResponseCache, get_response_cache
+from .json_stream import CHUNK_SIZE, DEFAULT_BATCH_SIZE, iter_file_chunks, iter_json_array
 
-API_URL = "https://work-log.cc/api"
+if TYPE_CHECKING:
+    import requests
 
+# Overridable so the client can be pointed at a local stub server.
+API_URL = os.environ.get("WORKLOG_API_URL", "https://work-log.cc/api")
 
-def _handle_auth(resp: requests.Response, sign_out: Optional[Callable[[], None]] = None) -> None:
-    """Trigger sign out if response indicates authentication failure."""
+DEFAULT_PAGE_SIZE = 200
+
+# (connect, read) timeouts in seconds, keyed by endpoint name.
+DEFAULT_TIMEOUTS: Dict[str, tuple[float, float]] = {
+    "default": (5, 10),
+    "users": (5, 10),
+    "worklogs": (5, 10),
+    "worklog": (5, 10),
+    "tags": (5, 10),
+    "token": (5, 10),
+}
+
+
+class ApiClient:
+    """Owns one pooled keep-alive ``requests.Session`` per host.
+
+    Reusing sessions avoids a TCP+TLS handshake on every call, which on
+    high-latency links costs more than the payload itself.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 4,
+        timeouts: Optional[Dict[str, tuple[float, float]]] = None,
+    ) -> None:
+        self.pool_size = pool_size
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self._sessions: Dict[str, "requests.Session"] = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, url: str) -> "requests.Session":
+        """Return the shared session for the host of ``url``."""
+        # Imported on first use: requests costs ~100 ms and the first call
+        # always happens on a worker thread, after the window has painted.
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.pool_size
+                )
+                session.mount(f"{host}/", adapter)
+                session.headers.update(
+                    {
+                        "Accept-Encoding": "gzip, deflate",
+                        "Connection": "keep-alive",
+                    }
+                )
+                self._sessions[host] = session
+        return session
+
+    def timeout_for(self, endpoint: str) -> tuple[float, float]:
+        return self.timeouts.get(endpoint, self.timeouts["default"])
+
+    def request(
+        self, method: str, url: str, *, endpoint: str = "default", **kwargs: Any
+    ) -> "requests.Response":
+        """Send a request through the pooled session for ``url``'s host.
+
+        Traced with latency, status and bytes; only the path is recorded,
+        since query strings can carry API keys.
+        """
+        kwargs.setdefault("timeout", self.timeout_for(endpoint))
+        with tracing.span(f"{method} {urlsplit(url).path}", "http", endpoint=endpoint) as fields:
+            resp = self.session_for(url).request(method, url, **kwargs)
+            fields["status"] = resp.status_code
+            length = resp.headers.get("Content-Length", "")
+            if length.isdigit():
+                fields["bytes"] = int(length)
+            elif not kwargs.get("stream"):
+                fields["bytes"] = len(resp.content)
+            tracing.count("http.requests")
+            tracing.count("http.bytes", fields.get("bytes", 0))
+        return resp
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_client: Optional[ApiClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> ApiClient:
+    """Return the process-wide :class:`ApiClient`."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ApiClient()
+        return _client
+
+
+def _handle_auth(resp: "requests.Response", sign_out: Optional[Callable[[], None]] = None) -> None:
+    """Trigger sign out if response indicates authentication failure.
+
+    Skipped when the session already ended, e.g. because the refresh
+    attempted for this 401 failed and signed out itself.
+    """
     if resp.status_code in (401, 403):
-        if sign_out:
+        signed_out = _signed_out
+        if sign_out and not (signed_out is not None and signed_out()):
             sign_out()
 
 
+# Callable returning a freshly refreshed ID token (or None); set by TokenManager.
+_token_refresher: Optional[Callable[[], Optional[str]]] = None
+# Callable telling whether the session has ended; set by TokenManager.
+_signed_out: Optional[Callable[[], bool]] = None
+
+
+def set_token_refresher(
+    refresher: Optional[Callable[[], Optional[str]]],
+    signed_out: Optional[Callable[[], bool]] = None,
+) -> None:
+    """Register the hooks used to refresh and retry once after a 401."""
+    global _token_refresher, _signed_out
+    _token_refresher = refresher
+    _signed_out = signed_out
+
+
+def _authorized_request(
+    method: str,
+    url: str,
+    token: str,
+    *,
+    endpoint: str,
+    headers: Optional[Dict[str, str]] = None,
+    **kwargs: Any,
+) -> "requests.Response":
+    """Send with a Bearer token, refreshing it and retrying once on 401."""
+    headers = dict(headers or {})
+    headers["Authorization"] = f"Bearer {token}"
+    resp = get_client().request(method, url, endpoint=endpoint, headers=headers, **kwargs)
+    refresher = _token_refresher
+    if resp.status_code == 401 and refresher is not None:
+        new_token = refresher()
+        if new_token and new_token != token:
+            resp.close()
+            headers["Authorization"] = f"Bearer {new_token}"
+            resp = get_client().request(
+                method, url, endpoint=endpoint, headers=headers, **kwargs
+            )
+    return resp
+
+
+_NOT_CACHED = object()
+
+
+def _cache_key(cache: ResponseCache, url: str, params: Optional[Dict[str, Any]], token: str) -> str:
+    # Keyed by user rather than token, so entries survive token refreshes.
+    return cache.key(url, params, token_user_id(token))
+
+
+def _cached_get(
+    url: str,
+    token: str,
+    *,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    sign_out: Optional[Callable[[], None]] = None,
+) -> Any:
+    """GET JSON through the response cache using conditional requests.
+
+    Sends the stored ``ETag``/``Last-Modified`` validators; a 304 is answered
+    from the cache, without decoding when the parsed body is still in
+    memory.
+    """
+    cache = get_response_cache()
+    key = _cache_key(cache, url, params, token)
+    headers = cache.validators(key)
+    resp = _authorized_request(
+        "GET", url, token, endpoint=endpoint, params=params, headers=headers
+    )
+    _handle_auth(resp, sign_out)
+    if resp.status_code == 304:
+        data = cache.load(key, _NOT_CACHED)
+        if data is not _NOT_CACHED:
+            return data
+        # The entry vanished after the validators were read; ask again in full.
+        resp = _authorized_request("GET", url, token, endpoint=endpoint, params=params)
+        _handle_auth(resp, sign_out)
+    resp.raise_for_status()
+    data = resp.json()
+    if "no-store" in resp.headers.get("Cache-Control", ""):
+        cache.discard(key)
+    else:
+        cache.store(
+            key,
+            resp.content,
+            data,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+    return data
+
+
+def _stream_get(
+    url: str,
+    token: str,
+    *,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sign_out: Optional[Callable[[], None]] = None,
+) -> Iterator[List[Any]]:
+    """GET a JSON array and yield it in batches while it downloads.
+
+    Uses the same cache entries as :func:`_cached_get`: a 304 replays the
+    in-memory copy or streams the stored body from disk, and a 200 is
+    written to the cache chunk by chunk as it is parsed.
+    """
+    cache = get_response_cache()
+    key = _cache_key(cache, url, params, token)
+    resp = _authorized_request(
+        "GET", url, token, endpoint=endpoint, params=params,
+        headers=cache.validators(key), stream=True,
+    )
+    try:
+        _handle_auth(resp, sign_out)
+        if resp.status_code == 304:
+            data = cache.peek(key, _NOT_CACHED)
+            if data is not _NOT_CACHED:
+                for i in range(0, len(data), batch_size):
+                    yield data[i:i + batch_size]
+                return
+            body = cache.open_body(key)
+            if body is not None:
+                with body:
+                    yield from iter_json_array(iter_file_chunks(body), batch_size)
+                return
+            # The entry vanished after the validators were read; ask again in full.
+            resp.close()
+            resp = _authorized_request(
+                "GET", url, token, endpoint=endpoint, params=params, stream=True
+            )
+            _handle_auth(resp, sign_out)
+        resp.raise_for_status()
+
+        writer = None
+        if "no-store" in resp.headers.get("Cache-Control", ""):
+            cache.discard(key)
+        else:
+            writer = cache.writer(
+                key,
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+            )
+
+        def chunks() -> Iterator[bytes]:
+            for chunk in resp.iter_content(CHUNK_SIZE):
+                if writer is not None:
+                    writer.write(chunk)
+                yield chunk
+
+        try:
+            yield from iter_json_array(chunks(), batch_size)
+        except BaseException:
+            if writer is not None:
+                writer.abort()
+            raise
+        if writer is not None:
+            writer.commit()
+    finally:
+        resp.close()
+
+
 def authenticate_user(id_token: str) -> dict:
     """Create or update the user on the backend using the Firebase ID token."""
 
-    # Decode the JWT without verification to extract basic user info. This
-    # avoids pulling in heavy dependencies solely for base64 decoding.
-    try:
-        payload = id_token.split(".")[1]
-        padded = payload + "=" * (-len(payload) % 4)
-        claims = json.loads(base64.urlsafe_b64decode(padded).decode("utf-8"))
-    except Exception:
-        claims = {}
+    # Decode the JWT without verification to extract basic user info.
+    claims = decode_claims(id_token)
 
     data = {
         "id": claims.get("user_id"),
@@ -34,8 +306,10 @@ def authenticate_user(id_token: str) -> dict:
         "name": claims.get("name"),
     }
 
-    response = requests.post(
+    response = get_client().request(
+        "POST",
         f"{API_URL}/users/",
+        endpoint="users",
         json=data,
         headers={"Authorization": f"Bearer {id_token}"},
     )
@@ -43,7 +317,13 @@ def authenticate_user(id_token: str) -> dict:
     return response.json()
 
 
-def get_worklogs(token: str, *, sign_out: Optional[Callable[[], None]] = None, **params: Any) -> Dict[str, Any]:
+def get_worklogs(
+    token: str,
+    *,
+    sign_out: Optional[Callable[[], None]] = None,
+    cache: bool = True,
+    **params: Any,
+) -> Dict[str, Any]:
     """Return worklogs JSON from the backend.
 
     Parameters
@@ -52,17 +332,140 @@ def get_worklogs(token: str, *, sign_out: Optional[Callable[[], None]] = None, *
         ID token for the current user.
     sign_out:
         Optional callback invoked when the server responds with 401 or 403.
+    cache:
+        Go through the response cache. Pass ``False`` for one-off queries
+        such as delta syncs and exports, whose entries would never be read
+        again and would only push month pages out.
     params:
         Query parameters forwarded to the API.
     """
     url = f"{API_URL}/worklogs"
-    headers = {"Authorization": f"Bearer {token}"}
-    resp = requests.get(url, headers=headers, params=params, timeout=10)
+    if cache:
+        return _cached_get(url, token, endpoint="worklogs", params=params, sign_out=sign_out)
+    resp = _authorized_request("GET", url, token, endpoint="worklogs", params=params)
     _handle_auth(resp, sign_out)
     resp.raise_for_status()
     return resp.json()
 
 
+def get_tags(token: str, *, sign_out: Optional[Callable[[], None]] = None, **params: Any) -> List[Dict[str, Any]]:
+    """Return the tags visible to the current user."""
+    data = _cached_get(f"{API_URL}/tags/", token, endpoint="tags", params=params, sign_out=sign_out)
+    return list(data or [])
+
+
+def month_range(month: _dt.date) -> tuple[_dt.date, _dt.date]:
+    """Return the half-open ``[start, end)`` date window covering ``month``."""
+    start = month.replace(day=1)
+    if start.month == 12:
+        end = start.replace(year=start.year + 1, month=1)
+    else:
+        end = start.replace(month=start.month + 1)
+    return start, end
+
+
+def get_worklog_page(
+    token: str,
+    *,
+    start: Optional[_dt.date] = None,
+    end: Optional[_dt.date] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    offset: int = 0,
+    sign_out: Optional[Callable[[], None]] = None,
+    cache: bool = True,
+    **params: Any,
+) -> List[Dict[str, Any]]:
+    """Return one page of worklogs whose ``record_time`` lies in ``[start, end)``.
+
+    Parameters
+    ----------
+    start, end:
+        Optional date window; omitted bounds are left open.
+    limit, offset:
+        Page size and number of records to skip.
+    cache:
+        As for :func:`get_worklogs`.
+    """
+    params = _page_params(start, end, limit, offset, params)
+    return list(get_worklogs(token, sign_out=sign_out, cache=cache, **params) or [])
+
+
+def stream_worklog_page(
+    token: str,
+    *,
+    start: Optional[_dt.date] = None,
+    end: Optional[_dt.date] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    offset: int = 0,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sign_out: Optional[Callable[[], None]] = None,
+    **params: Any,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Like :func:`get_worklog_page`, but yield batches as the body arrives.
+
+    Only one batch of records is decoded and held at a time, so callers
+    can render the first logs before the download finishes.
+    """
+    params = _page_params(start, end, limit, offset, params)
+    return _stream_get(
+        f"{API_URL}/worklogs",
+        token,
+        endpoint="worklogs",
+        params=params,
+        batch_size=batch_size,
+        sign_out=sign_out,
+    )
+
+
+def _page_params(
+    start: Optional[_dt.date],
+    end: Optional[_dt.date],
+    limit: int,
+    offset: int,
+    params: Dict[str, Any],
+) -> Dict[str, Any]:
+    if start is not None:
+        params["start_time"] = start.isoformat()
+    if end is not None:
+        params["end_time"] = end.isoformat()
+    params["limit"] = limit
+    params["offset"] = offset
+    return params
+
+
+def iter_worklog_pages(
+    token: str,
+    *,
+    start: Optional[_dt.date] = None,
+    end: Optional[_dt.date] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    sign_out: Optional[Callable[[], None]] = None,
+    cache: bool = True,
+    **params: Any,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield successive pages of worklogs until a short page is returned.
+
+    ``cache`` is passed on to :func:`get_worklog_page`.
+    """
+    offset = 0
+    while True:
+        page = get_worklog_page(
+            token,
+            start=start,
+            end=end,
+            limit=page_size,
+            offset=offset,
+            sign_out=sign_out,
+            cache=cache,
+            **params,
+        )
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        offset += len(page)
+
+
 def update_worklog(
     token: str,
     worklog_id: str,
@@ -85,7 +488,6 @@ def update_worklog(
     """
     url = f"{API_URL}/worklogs/{worklog_id}"
     headers = {
-        "Authorization": f"Bearer {token}",
         "Content-Type": "application/json",
         "Accept": "application/json, text/plain, */*",
     }
@@ -95,10 +497,11 @@ def update_worklog(
     }
     if tag_id:
         data["tag_id"] = tag_id
-    resp = requests.patch(url, headers=headers, json=data, timeout=10)
+    resp = _authorized_request(
+        "PATCH", url, token, endpoint="worklog", headers=headers, json=data
+    )
     _handle_auth(resp, sign_out)
     resp.raise_for_status()
-    print(resp.json())
     return resp.json()
 
 
@@ -118,10 +521,9 @@ def delete_worklog(
     """
     url = f"{API_URL}/worklogs/{worklog_id}"
     headers = {
-        "Authorization": f"Bearer {token}",
         "Accept": "application/json, text/plain, */*",
     }
-    resp = requests.delete(url, headers=headers, timeout=10)
+    resp = _authorized_request("DELETE", url, token, endpoint="worklog", headers=headers)
     _handle_auth(resp, sign_out)
     resp.raise_for_status()
     # 通常刪除不回傳內容
@@ -1,44 +1,120 @@
 import json
-import secretstorage
+import threading
+
+from ... import tracing
+from .tokens import token_expiry
 
 SERVICE_NAME = "worklog-desktop"
 
 
 def get_connection():
+    # Imported lazily: secretstorage pulls in jeepney and cryptography.
+    import secretstorage
+
     try:
         return secretstorage.dbus_init()
     except secretstorage.exceptions.SecretServiceNotAvailableException:
         return None
 
 
-def store_credentials(credentials: dict):
-    conn = get_connection()
-    if not conn:
-        return
+class CredentialStore:
+    """Secret Service credentials behind one connection and an in-memory copy.
 
-    collection = secretstorage.get_default_collection(conn)
-    attributes = {"application": SERVICE_NAME}
-    collection.create_item("User Credentials", attributes, json.dumps(credentials).encode("utf-8"))
+    The secret is read and decrypted once; later reads are served from
+    memory and writes only reach D-Bus when the credentials changed.
+    """
 
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._conn = None
+        self._loaded = False
+        self._cache: dict | None = None
+        self.expires_at: float | None = None
 
-def get_credentials() -> dict | None:
-    conn = get_connection()
-    if not conn:
+    def _collection(self):
+        if self._conn is None:
+            self._conn = get_connection()
+            if self._conn is None:
+                return None
+        import secretstorage
+
+        return secretstorage.get_default_collection(self._conn)
+
+    def _call(self, fn):
+        """Run ``fn(collection)``, reconnecting once if the bus went away."""
+        for attempt in range(2):
+            collection = self._collection()
+            if collection is None:
+                return None
+            try:
+                return fn(collection)
+            except OSError:
+                # Stale D-Bus socket (e.g. the session bus restarted).
+                self._conn = None
+                if attempt:
+                    raise
         return None
 
-    collection = secretstorage.get_default_collection(conn)
-    items = collection.search_items({"application": SERVICE_NAME})
-    for item in items:
-        return json.loads(item.get_secret().decode("utf-8"))
-    return None
+    def _set_cache(self, creds: dict | None) -> None:
+        self._cache = dict(creds) if creds else None
+        self._loaded = True
+        self.expires_at = token_expiry(self._cache.get("id_token")) if self._cache else None
+
+    def get(self) -> dict | None:
+        with self._lock:
+            if not self._loaded:
+                def load(collection):
+                    for item in collection.search_items({"application": SERVICE_NAME}):
+                        return json.loads(item.get_secret().decode("utf-8"))
+                    return None
+
+                with tracing.span("load", "credentials"):
+                    self._set_cache(self._call(load))
+            else:
+                tracing.count("credentials.cache_hits")
+            return dict(self._cache) if self._cache else None
+
+    def store(self, creds: dict) -> None:
+        with self._lock:
+            if self._loaded and creds == self._cache:
+                return
+            secret = json.dumps(creds).encode("utf-8")
+            with tracing.span("store", "credentials"):
+                self._call(
+                    lambda collection: collection.create_item(
+                        "User Credentials",
+                        {"application": SERVICE_NAME},
+                        secret,
+                        replace=True,
+                    )
+                )
+            self._set_cache(creds)
+
+    def delete(self) -> None:
+        with self._lock:
+            def delete_all(collection):
+                for item in collection.search_items({"application": SERVICE_NAME}):
+                    item.delete()
+
+            with tracing.span("delete", "credentials"):
+                self._call(delete_all)
+            self._set_cache(None)
+
+
+_store = CredentialStore()
+
+
+def get_store() -> CredentialStore:
+    return _store
+
+
+def store_credentials(credentials: dict):
+    _store.store(credentials)
+
+
+def get_credentials() -> dict | None:
+    return _store.get()
 
 
 def delete_credentials():
-    conn = get_connection()
-    if not conn:
-        return
-
-    collection = secretstorage.get_default_collection(conn)
-    items = collection.search_items({"application": SERVICE_NAME})
-    for item in items:
-        item.delete()
+    _store.delete()
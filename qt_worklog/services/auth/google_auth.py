@@ -4,11 +4,8 @@ import json
 from pathlib import Path
 from typing import Tuple
 
-import requests
-from google.auth.transport.requests import Request as GARequest
-from google_auth_oauthlib.flow import InstalledAppFlow
-
 from ... import config
+from ..api_client import get_client
 
 # Scopes required to receive an ID token that includes the user's identity.
 # Use the canonical userinfo scope URIs to avoid scope mismatch warnings.
@@ -35,6 +32,11 @@ def _client_secrets_path() -> Path:
 
 def do_google_oauth() -> Tuple[str, str | None]:
     """Run the InstalledAppFlow and return (google_id_token, refresh_token?)."""
+    # The OAuth stack is only needed for an interactive login, so keep it
+    # out of the startup path.
+    from google.auth.transport.requests import Request as GARequest
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     secrets = _client_secrets_path()
     flow = InstalledAppFlow.from_client_secrets_file(str(secrets), SCOPES)
     creds = flow.run_local_server(port=0, open_browser=True)
@@ -73,7 +75,7 @@ def exchange_google_to_firebase(api_key: str, google_id_token: str) -> Tuple[str
         "postBody": f"id_token={google_id_token}&providerId=google.com",
         "returnSecureToken": True,
     }
-    resp = requests.post(url, json=payload, timeout=10)
+    resp = get_client().request("POST", url, endpoint="token", json=payload)
     resp.raise_for_status()
     data = resp.json()
 
@@ -101,7 +103,7 @@ def refresh_firebase_token(api_key: str, refresh_token: str) -> dict:
     """
     url = f"https://securetoken.googleapis.com/v1/token?key={api_key}"
     payload = {"grant_type": "refresh_token", "refresh_token": refresh_token}
-    resp = requests.post(url, data=payload, timeout=10)
+    resp = get_client().request("POST", url, endpoint="token", data=payload)
     resp.raise_for_status()
     data = resp.json()
 
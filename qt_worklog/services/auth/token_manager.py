@@ -1,60 +1,230 @@
-from PySide6.QtCore import QObject, QTimer, Signal, Slot, Qt
+import logging
+import threading
+import time
+
+from PySide6.QtCore import QObject, QThreadPool, QTimer, Signal, Slot, Qt
 from PySide6.QtGui import QGuiApplication
 
 from . import google_auth, credentials
-from ... import config
+from .. import api_client, session
+from ..workers import Worker
+from ... import config, tracing
+
+logger = logging.getLogger(__name__)
+
+# Refresh this long before the ID token's ``exp`` claim.
+REFRESH_MARGIN_S = 5 * 60
+# Used when the token carries no readable ``exp``; Firebase tokens last 1 hour.
+FALLBACK_REFRESH_S = 55 * 60
+
+
+class _SingleFlight:
+    """Collapse concurrent calls into one; followers wait for its result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._done: threading.Event | None = None
+        self._result = None
+
+    @property
+    def in_flight(self) -> bool:
+        return self._done is not None
+
+    def run(self, fn):
+        with self._lock:
+            done = self._done
+            leader = done is None
+            if leader:
+                done = self._done = threading.Event()
+        if not leader:
+            done.wait()
+            return self._result
+        result = None
+        try:
+            result = fn()
+        finally:
+            self._result = result
+            with self._lock:
+                self._done = None
+            done.set()
+        return result
 
 
 class TokenManager(QObject):
+    """Keeps the Firebase ID token fresh.
+
+    Credentials are read from the Secret Service on a worker thread by
+    :meth:`load`, so D-Bus never delays the first paint. Until that
+    finishes :meth:`get_token` returns ``None``; ``ready`` fires once a
+    stored session was found, ``login_required`` otherwise.
+
+    The local data belongs to the signed-in user: it is wiped whenever
+    ``login_required`` fires, which :meth:`sign_out` does once however many
+    callers notice the session ended.
+    """
+
     login_required = Signal()
+    token_refreshed = Signal()
+    ready = Signal()
 
     def __init__(self):
         super().__init__()
+        self._flight = _SingleFlight()
+        self._sign_out_lock = threading.Lock()
+        self._loaded = False
+        self._load_worker: Worker | None = None
         self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
         self.timer.timeout.connect(self.refresh_token)
-        # Firebase ID tokens expire after 1 hour (3600s). Refresh a bit sooner.
-        self.timer.start(55 * 60 * 1000)  # 55 minutes
+        self.token_refreshed.connect(self.schedule_refresh)
+        # Emitted from worker threads too; the wipe runs on the GUI thread,
+        # before the windows react.
+        self.login_required.connect(self._on_login_required)
 
-        # Refresh immediately on startup so resumed sessions get a fresh token.
-        self.refresh_token()
+        api_client.set_token_refresher(self.refresh_token_blocking, self.is_signed_out)
 
-        # Also refresh whenever the application becomes active again (resume).
+        # Also check whenever the application becomes active again (resume).
         app = QGuiApplication.instance()
         if app:
             app.applicationStateChanged.connect(self._on_app_state_changed)
 
+    def is_ready(self) -> bool:
+        """Whether the stored credentials have been read."""
+        return self._loaded
+
+    def load(self) -> None:
+        """Read the stored credentials in the background."""
+        self._load_worker = Worker(0, credentials.get_credentials)
+        self._load_worker.signals.finished.connect(self._on_loaded)
+        self._load_worker.signals.failed.connect(self._on_load_failed)
+        QThreadPool.globalInstance().start(self._load_worker)
+
+    @Slot(int, object)
+    def _on_loaded(self, _generation: int, creds) -> None:
+        self._load_worker = None
+        self._loaded = True
+        if not creds:
+            self.login_required.emit()
+            return
+        session.claim_session(creds.get("id_token"))
+        self.ready.emit()
+        # Resumed sessions only hit the network if the stored token is stale.
+        self._refresh_if_expiring()
+
+    @Slot(int, object)
+    def _on_load_failed(self, _generation: int, error) -> None:
+        logger.error("Failed to read credentials: %s", error)
+        self._load_worker = None
+        self._loaded = True
+        self.login_required.emit()
+
     def get_token(self) -> str | None:
         """Return the current ID token if available and not expired."""
+        if not self._loaded:
+            return None
         creds = credentials.get_credentials()
         if creds:
             return creds.get("id_token")
         return None
 
-    def clear_token(self) -> None:
-        """Remove any stored credentials."""
-        credentials.delete_credentials()
+    def is_signed_out(self) -> bool:
+        """Whether a loaded session has ended; storing new credentials resumes it."""
+        return self._loaded and not credentials.get_credentials()
+
+    def sign_out(self) -> None:
+        """Forget the stored credentials and ask for a new login.
 
+        Safe from any thread. Only the first call of a session acts, so a
+        failed refresh and the 401s that caused it sign out once.
+        """
+        with self._sign_out_lock:
+            if self.is_signed_out():
+                return
+            credentials.delete_credentials()
+        self.login_required.emit()
+
+    @Slot()
+    def _on_login_required(self) -> None:
+        self.timer.stop()
+        session.clear_session_data()
+
+    def seconds_until_expiry(self) -> float | None:
+        credentials.get_credentials()
+        expires_at = credentials.get_store().expires_at
+        if expires_at is None:
+            return None
+        return expires_at - time.time()
+
+    @Slot()
     def refresh_token(self):
-        """Refresh the stored Firebase ID token."""
+        """Refresh the stored Firebase ID token on a worker thread."""
+        if self._flight.in_flight:
+            return
+        QThreadPool.globalInstance().start(Worker(0, self.refresh_token_blocking))
+
+    def refresh_token_blocking(self) -> str | None:
+        """Refresh now and return the new ID token; safe from any thread.
+
+        Concurrent callers share a single in-flight request. Never call this
+        from the GUI thread.
+        """
+        return self._flight.run(self._traced_refresh)
+
+    def _traced_refresh(self) -> str | None:
+        with tracing.span("refresh_token", "auth") as fields:
+            token = self._do_refresh()
+            fields["ok"] = token is not None
+        return token
+
+    def _do_refresh(self) -> str | None:
+        import requests
+
         creds = credentials.get_credentials()
         if not creds:
-            self.login_required.emit()
-            return
+            # Signed out already; the login was asked for then.
+            return None
 
         try:
             api_key = config.FIREBASE_CONFIG["apiKey"]
             new_token_data = google_auth.refresh_firebase_token(
                 api_key, creds["refresh_token"]
             )
-            creds.update(new_token_data)
-            credentials.store_credentials(creds)
-            print("Token refreshed successfully.")
+        except (requests.ConnectionError, requests.Timeout) as e:
+            # Offline: keep the credentials and try again on the next cycle.
+            logger.warning("Failed to refresh token, keeping credentials: %s", e)
+            self.token_refreshed.emit()
+            return None
         except Exception as e:
-            print(f"Failed to refresh token: {e}")
-            credentials.delete_credentials()
-            self.login_required.emit()
+            logger.error("Failed to refresh token: %s", e)
+            self.sign_out()
+            return None
+
+        creds.update(new_token_data)
+        credentials.store_credentials(creds)
+        logger.info("Token refreshed successfully.")
+        self.token_refreshed.emit()
+        return creds["id_token"]
+
+    def _refresh_if_expiring(self) -> None:
+        if not self._loaded or not credentials.get_credentials():
+            return
+        remaining = self.seconds_until_expiry()
+        if remaining is None or remaining <= REFRESH_MARGIN_S:
+            self.refresh_token()
+        else:
+            self.schedule_refresh()
+
+    @Slot()
+    def schedule_refresh(self) -> None:
+        """Arm the timer for shortly before the current token's ``exp``."""
+        remaining = self.seconds_until_expiry()
+        if remaining is None:
+            delay = FALLBACK_REFRESH_S
+        else:
+            delay = max(30, remaining - REFRESH_MARGIN_S)
+        self.timer.start(int(delay * 1000))
 
     @Slot(Qt.ApplicationState)
     def _on_app_state_changed(self, state: Qt.ApplicationState) -> None:
         if state == Qt.ApplicationActive:
-            self.refresh_token()
+            self._refresh_if_expiring()
@@ -0,0 +1,35 @@
+import base64
+import json
+
+
+def decode_claims(token: str) -> dict:
+    """Decode a JWT payload without verifying it; ``{}`` if malformed.
+
+    Only used to read informational claims such as ``exp`` or the user's
+    name, so no signature check (and no extra dependency) is needed.
+    """
+    try:
+        payload = token.split(".")[1]
+        padded = payload + "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded).decode("utf-8"))
+    except Exception:
+        return {}
+
+
+def token_user_id(token: str | None) -> str | None:
+    """Return the Firebase user id (``user_id``, else ``sub``) of ``token``."""
+    if not token:
+        return None
+    claims = decode_claims(token)
+    return claims.get("user_id") or claims.get("sub")
+
+
+def token_expiry(token: str | None) -> float | None:
+    """Return the ``exp`` claim of ``token`` as a Unix timestamp, if present."""
+    if not token:
+        return None
+    exp = decode_claims(token).get("exp")
+    try:
+        return float(exp)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,287 @@
+import csv
+import json
+import os
+import re
+import threading
+import zipfile
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, Optional
+from xml.sax.saxutils import escape
+
+from PySide6.QtCore import QObject, QThreadPool, Signal, Slot
+
+from . import api_client
+from .local_store import WorklogStore, get_store
+from .mutation_queue import MutationJournal
+from .workers import Worker
+from ..models.tag_filter import record_tag_ids
+
+COLUMNS = ["id", "record_time", "content", "tags", "space_id", "created_at", "updated_at"]
+
+FORMATS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".json": "json",
+    ".xlsx": "xlsx",
+}
+
+# Excel rejects longer cell strings.
+_XLSX_CELL_MAX = 32767
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def format_for_path(path: Path) -> str:
+    try:
+        return FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported export format: {path.suffix or path.name}")
+
+
+def _cell(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+def row_values(rec: Mapping[str, Any]) -> List[str]:
+    return [
+        _cell(rec.get("id")),
+        _cell(rec.get("record_time")),
+        _cell(rec.get("content")),
+        ", ".join(record_tag_ids(rec)),
+        _cell(rec.get("space_id")),
+        _cell(rec.get("created_at")),
+        _cell(rec.get("updated_at")),
+    ]
+
+
+class CsvWriter:
+    def __init__(self, path: Path):
+        self._file = open(path, "w", newline="", encoding="utf-8-sig")
+        self._csv = csv.writer(self._file)
+        self._csv.writerow(COLUMNS)
+
+    def write(self, records: Iterable[Mapping[str, Any]]) -> None:
+        self._csv.writerows(row_values(rec) for rec in records)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class NdjsonWriter:
+    def __init__(self, path: Path):
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, records: Iterable[Mapping[str, Any]]) -> None:
+        for rec in records:
+            self._file.write(json.dumps(rec, ensure_ascii=False))
+            self._file.write("\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class JsonWriter:
+    """Writes one JSON array, streamed a record at a time."""
+
+    def __init__(self, path: Path):
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write("[")
+        self._first = True
+
+    def write(self, records: Iterable[Mapping[str, Any]]) -> None:
+        for rec in records:
+            self._file.write("\n" if self._first else ",\n")
+            self._file.write(json.dumps(rec, ensure_ascii=False))
+            self._first = False
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.write("\n]\n")
+        self._file.close()
+
+
+class XlsxWriter:
+    """Minimal single-sheet XLSX writer using inline strings.
+
+    The sheet XML is streamed into the zip row by row, so neither pandas
+    nor an Excel library is needed and memory does not grow with rows.
+    """
+
+    _CONTENT_TYPES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        "</Types>"
+    )
+    _ROOT_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    )
+    _WORKBOOK = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Worklogs" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    )
+    _WORKBOOK_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        "</Relationships>"
+    )
+
+    def __init__(self, path: Path):
+        self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._sheet = self._zip.open("xl/worksheets/sheet1.xml", "w", force_zip64=True)
+        self._put(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            "<sheetData>"
+        )
+        self._put(self._row(COLUMNS))
+
+    def _put(self, text: str) -> None:
+        self._sheet.write(text.encode("utf-8"))
+
+    @staticmethod
+    def _row(values: List[str]) -> str:
+        cells = "".join(
+            '<c t="inlineStr"><is><t xml:space="preserve">'
+            f"{escape(_XML_ILLEGAL.sub('', value[:_XLSX_CELL_MAX]))}"
+            "</t></is></c>"
+            for value in values
+        )
+        return f"<row>{cells}</row>"
+
+    def write(self, records: Iterable[Mapping[str, Any]]) -> None:
+        self._put("".join(self._row(row_values(rec)) for rec in records))
+
+    def close(self) -> None:
+        self._put("</sheetData></worksheet>")
+        self._sheet.close()
+        self._zip.writestr("[Content_Types].xml", self._CONTENT_TYPES)
+        self._zip.writestr("_rels/.rels", self._ROOT_RELS)
+        self._zip.writestr("xl/workbook.xml", self._WORKBOOK)
+        self._zip.writestr("xl/_rels/workbook.xml.rels", self._WORKBOOK_RELS)
+        self._zip.close()
+
+
+_WRITERS = {"csv": CsvWriter, "ndjson": NdjsonWriter, "json": JsonWriter, "xlsx": XlsxWriter}
+
+
+def source_pages(
+    token: Optional[str],
+    store: Optional[WorklogStore] = None,
+    *,
+    sign_out=None,
+) -> Iterator[List[Mapping[str, Any]]]:
+    """Yield pages of the full history, from the server or, offline, the cache."""
+    import requests
+
+    store = store or get_store()
+    journal = MutationJournal(store)
+    if token:
+        pages = api_client.iter_worklog_pages(token, sign_out=sign_out, cache=False)
+        try:
+            first = next(pages, None)
+        except (requests.ConnectionError, requests.Timeout):
+            pass
+        else:
+            if first is not None:
+                yield journal.overlay(first)
+                for page in pages:
+                    yield journal.overlay(page)
+            return
+    yield from store.iter_worklogs()
+
+
+def export_worklogs(
+    path: Path,
+    pages: Iterable[List[Mapping[str, Any]]],
+    *,
+    keep: Optional[Callable[[Mapping[str, Any]], bool]] = None,
+    progress: Optional[Callable[[int], None]] = None,
+    cancelled: Optional[threading.Event] = None,
+) -> int:
+    """Stream ``pages`` into ``path`` and return the number of rows written.
+
+    The file is written next to ``path`` and moved into place only when
+    complete, so a cancelled or failed export leaves nothing behind.
+    """
+    path = Path(path)
+    writer_cls = _WRITERS[format_for_path(path)]
+    tmp = path.with_name(f".{path.name}.part")
+    writer = writer_cls(tmp)
+    count = 0
+    try:
+        for page in pages:
+            if cancelled is not None and cancelled.is_set():
+                raise ExportCancelled()
+            rows = [rec for rec in page if keep is None or keep(rec)]
+            writer.write(rows)
+            count += len(rows)
+            if progress is not None:
+                progress(count)
+        writer.close()
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            writer.close()
+        except Exception:
+            pass
+        tmp.unlink(missing_ok=True)
+        raise
+    return count
+
+
+class ExportJob(QObject):
+    """Runs one export on the thread pool with progress and cancel."""
+
+    progress = Signal(int)
+    finished = Signal(str, int)
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, path: Path, token: Optional[str], keep=None, parent: QObject | None = None):
+        super().__init__(parent)
+        self.path = Path(path)
+        self._cancel = threading.Event()
+        self._worker = Worker(
+            0,
+            lambda: export_worklogs(
+                self.path,
+                source_pages(token),
+                keep=keep,
+                progress=self.progress.emit,
+                cancelled=self._cancel,
+            ),
+        )
+        self._worker.signals.finished.connect(self._on_finished)
+        self._worker.signals.failed.connect(self._on_failed)
+
+    def start(self) -> None:
+        QThreadPool.globalInstance().start(self._worker)
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @Slot(int, object)
+    def _on_finished(self, _generation: int, count: int) -> None:
+        self.finished.emit(str(self.path), count)
+
+    @Slot(int, object)
+    def _on_failed(self, _generation: int, error: Exception) -> None:
+        if isinstance(error, ExportCancelled):
+            self.cancelled.emit()
+        else:
+            self.failed.emit(str(error))
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Mapping, Optional, Tuple
+
+from .. import config
+
+# Parsed bodies kept in memory, so a 304 costs no JSON decode.
+MEMORY_ENTRIES = 32
+# Bodies kept on disk; the least recently written are removed first.
+DISK_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _stat(path: Path) -> Tuple[int, float]:
+    try:
+        st = path.stat()
+    except OSError:
+        return 0, 0.0
+    return st.st_size, st.st_mtime
+
+
+class ResponseCache:
+    """Validators and bodies of cacheable GET responses.
+
+    Entries are keyed by URL, query parameters and user, and stored one
+    file each: a JSON header line (``etag``, ``last_modified``) followed by
+    the raw body. The most recently used parsed bodies are also kept in
+    memory; callers must treat returned objects as read-only.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        *,
+        memory_entries: int = MEMORY_ENTRIES,
+        disk_max_bytes: int = DISK_MAX_BYTES,
+    ):
+        self.directory = Path(directory) if directory else config.get_cache_dir() / "http"
+        self.memory_entries = memory_entries
+        self.disk_max_bytes = disk_max_bytes
+        self._lock = threading.Lock()
+        # key -> ((etag, last_modified), parsed body)
+        self._memory: "OrderedDict[str, Tuple[Tuple[Optional[str], Optional[str]], Any]]" = OrderedDict()
+        self._disk_bytes: Optional[int] = None
+
+    @staticmethod
+    def key(url: str, params: Optional[Mapping[str, Any]], user: Optional[str]) -> str:
+        items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        raw = json.dumps([url, items, user or ""], separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.entry"
+
+    def _read_header(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+
+    def validators(self, key: str) -> Dict[str, str]:
+        """Conditional request headers for ``key``, empty when not cached."""
+        with self._lock:
+            cached = self._memory.get(key)
+        if cached is not None:
+            etag, last_modified = cached[0]
+        else:
+            header = self._read_header(key)
+            if header is None:
+                return {}
+            etag, last_modified = header.get("etag"), header.get("last_modified")
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        """Return the parsed body only if it is already in memory."""
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is None:
+                return default
+            self._memory.move_to_end(key)
+            return cached[1]
+
+    def open_body(self, key: str) -> Optional[BinaryIO]:
+        """Open the stored body for streaming, positioned after the header."""
+        try:
+            f = open(self._path(key), "rb")
+        except OSError:
+            return None
+        f.readline()
+        return f
+
+    def load(self, key: str, default: Any = None) -> Any:
+        """Return the parsed body for ``key``, decoding it from disk if needed."""
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                self._memory.move_to_end(key)
+                return cached[1]
+        try:
+            with open(self._path(key), "rb") as f:
+                header = json.loads(f.readline())
+                data = json.loads(f.read())
+        except (OSError, ValueError):
+            return default
+        self._remember(key, (header.get("etag"), header.get("last_modified")), data)
+        return data
+
+    def store(
+        self,
+        key: str,
+        body: bytes,
+        data: Any,
+        *,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Save a 200 response; responses without validators are not kept."""
+        if not etag and not last_modified:
+            self.discard(key)
+            return
+        header = json.dumps({"etag": etag, "last_modified": last_modified}).encode("utf-8")
+        path = self._path(key)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            old_size = _stat(path)[0]
+            with open(tmp, "wb") as f:
+                f.write(header + b"\n")
+                f.write(body)
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        self._remember(key, (etag, last_modified), data)
+        self._account(len(header) + 1 + len(body) - old_size)
+
+    def writer(
+        self,
+        key: str,
+        *,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> Optional["EntryWriter"]:
+        """Start saving a body that arrives in chunks; ``None`` if not cacheable."""
+        if not etag and not last_modified:
+            self.discard(key)
+            return None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            return EntryWriter(self, key, etag, last_modified)
+        except OSError:
+            return None
+
+    def _committed(self, key: str, size: int, old_size: int) -> None:
+        # The parsed body was never held whole, so drop any stale copy.
+        with self._lock:
+            self._memory.pop(key, None)
+        self._account(size - old_size)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._disk_bytes = 0
+        if self.directory.is_dir():
+            for path in self.directory.glob("*.entry"):
+                path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, validators, data: Any) -> None:
+        with self._lock:
+            self._memory[key] = (validators, data)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _account(self, delta: int) -> None:
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(_stat(p)[0] for p in self.directory.glob("*.entry"))
+            else:
+                self._disk_bytes += delta
+            if self._disk_bytes <= self.disk_max_bytes:
+                return
+            entries = sorted(self.directory.glob("*.entry"), key=lambda p: _stat(p)[1])
+            for path in entries:
+                if self._disk_bytes <= self.disk_max_bytes:
+                    break
+                size = _stat(path)[0]
+                path.unlink(missing_ok=True)
+                self._memory.pop(path.stem, None)
+                self._disk_bytes -= size
+
+
+class EntryWriter:
+    """Writes one streamed entry to a temp file, installed by :meth:`commit`."""
+
+    def __init__(self, cache: ResponseCache, key: str, etag: Optional[str], last_modified: Optional[str]):
+        self._cache = cache
+        self._key = key
+        self._path = cache._path(key)
+        self._tmp = self._path.with_suffix(f".{threading.get_ident()}.tmp")
+        self._file = open(self._tmp, "wb")
+        header = json.dumps({"etag": etag, "last_modified": last_modified}).encode("utf-8")
+        self._file.write(header + b"\n")
+        self._size = len(header) + 1
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+        self._size += len(chunk)
+
+    def commit(self) -> None:
+        self._file.close()
+        old_size = _stat(self._path)[0]
+        try:
+            os.replace(self._tmp, self._path)
+        except OSError:
+            self.abort()
+            return
+        self._cache._committed(self._key, self._size, old_size)
+
+    def abort(self) -> None:
+        self._file.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide :class:`ResponseCache`."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]) -> None:
+    """Swap the process-wide cache, e.g. for a temporary directory in tests."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
@@ -0,0 +1,95 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator, List
+
+# Records handed to the caller at a time.
+DEFAULT_BATCH_SIZE = 50
+# Bytes read from the socket or cache file per chunk.
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+def iter_json_array(chunks: Iterable[bytes], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Any]]:
+    """Parse a top-level JSON array from byte ``chunks``, yielding batches.
+
+    Only the unparsed tail of the text and the current batch are held, so
+    memory stays near one batch whatever the size of the document. Each
+    element is decoded with :meth:`json.JSONDecoder.raw_decode` once it is
+    complete; an element split across chunks is retried when more arrives.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    # "start" before "[", then "first" (value or "]"), "value" after a
+    # comma, "sep" after a value, and "end" after the closing bracket.
+    state = "start"
+    batch: List[Any] = []
+
+    def parse(final: bool) -> Iterator[List[Any]]:
+        nonlocal pos, state, batch
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buf):
+                return
+            char = buf[pos]
+            if state == "end":
+                raise ValueError("Unexpected data after JSON array")
+            if state == "start":
+                if char != "[":
+                    raise ValueError("Expected a JSON array")
+                state = "first"
+                pos += 1
+            elif state == "sep":
+                if char == ",":
+                    state = "value"
+                elif char == "]":
+                    state = "end"
+                else:
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+                pos += 1
+            elif char == "]" and state == "first":
+                state = "end"
+                pos += 1
+            else:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    return
+                if not final and not isinstance(value, (dict, list, str)):
+                    # A number is only complete once its delimiter arrived.
+                    rest = buf[end:].lstrip(_WHITESPACE)
+                    if not rest or rest[0] not in ",]":
+                        return
+                batch.append(value)
+                pos = end
+                state = "sep"
+                if len(batch) >= batch_size:
+                    out, batch = batch, []
+                    yield out
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buf = buf[pos:] + text.decode(chunk)
+        pos = 0
+        yield from parse(final=False)
+    buf = buf[pos:] + text.decode(b"", final=True)
+    pos = 0
+    yield from parse(final=True)
+    if state != "end":
+        raise ValueError("Truncated JSON array")
+    if batch:
+        yield batch
+
+
+def iter_file_chunks(f, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
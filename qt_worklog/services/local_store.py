@@ -0,0 +1,297 @@
+import datetime as _dt
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+from .. import config
+
+DB_FILENAME = "worklog.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS worklogs (
+    id TEXT PRIMARY KEY,
+    space_id TEXT,
+    record_time TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_worklogs_space_record_time
+    ON worklogs (space_id, record_time);
+-- The month view is not space-scoped yet, so it needs record_time on its own.
+CREATE INDEX IF NOT EXISTS idx_worklogs_record_time ON worklogs (record_time);
+CREATE INDEX IF NOT EXISTS idx_worklogs_updated_at ON worklogs (updated_at);
+
+CREATE TABLE IF NOT EXISTS tags (
+    id TEXT PRIMARY KEY,
+    space_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tags_space ON tags (space_id);
+
+CREATE TABLE IF NOT EXISTS spaces (
+    id TEXT PRIMARY KEY,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    watermark TEXT
+);
+
+-- Pending writes, at most one per worklog (see mutation_queue.py).
+CREATE TABLE IF NOT EXISTS mutations (
+    worklog_id TEXT PRIMARY KEY,
+    op TEXT NOT NULL,
+    payload TEXT,
+    version INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_mutations_next_attempt ON mutations (next_attempt_at);
+
+-- Store-wide settings, e.g. the user the cached data belongs to.
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+class WorklogStore:
+    """SQLite cache of worklogs, tags and spaces.
+
+    ``record_time`` is stored as the server's ISO string, whose first ten
+    characters are the record's own calendar date, so a month is a plain
+    string range query on the index.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        if path is None:
+            data_dir = config.get_data_dir()
+            data_dir.mkdir(parents=True, exist_ok=True)
+            path = data_dir / DB_FILENAME
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """Yield the connection inside a locked, committed transaction."""
+        with self._lock, self._conn:
+            yield self._conn
+
+    # Worklogs -----------------------------------------------------------
+
+    def upsert_worklogs(self, logs: Iterable[Mapping[str, Any]]) -> None:
+        with self._lock, self._conn:
+            self._write_worklogs(logs)
+
+    def _write_worklogs(self, logs: Iterable[Mapping[str, Any]]) -> None:
+        rows = [
+            (
+                str(rec["id"]),
+                _text(rec.get("space_id")),
+                _text(rec.get("record_time")),
+                _text(rec.get("updated_at")),
+                json.dumps(rec),
+            )
+            for rec in logs
+            if rec.get("id") is not None
+        ]
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO worklogs"
+            " (id, space_id, record_time, updated_at, data)"
+            " VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def delete_worklogs(self, ids: Iterable[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM worklogs WHERE id = ?", [(str(i),) for i in ids]
+            )
+
+    def prune_worklogs_between(
+        self,
+        start: _dt.date,
+        end: _dt.date,
+        keep_ids: Iterable[str],
+    ) -> List[str]:
+        """Delete worklogs in ``[start, end)`` not in ``keep_ids``; return their ids.
+
+        Run once a window's complete contents have been upserted, possibly
+        in several batches, to drop what was deleted upstream.
+        """
+        keep = {str(i) for i in keep_ids}
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT id FROM worklogs WHERE record_time >= ? AND record_time < ?",
+                (start.isoformat(), end.isoformat()),
+            ).fetchall()
+            stale = [row[0] for row in rows if row[0] not in keep]
+            self._conn.executemany(
+                "DELETE FROM worklogs WHERE id = ?", [(i,) for i in stale]
+            )
+        return stale
+
+    def worklogs_between(
+        self,
+        start: _dt.date,
+        end: _dt.date,
+        space_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return worklogs whose record date lies in ``[start, end)``, newest first."""
+        sql = "SELECT data FROM worklogs WHERE record_time >= ? AND record_time < ?"
+        args: list[Any] = [start.isoformat(), end.isoformat()]
+        if space_id is not None:
+            sql += " AND space_id = ?"
+            args.append(space_id)
+        sql += " ORDER BY record_time DESC"
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def apply_changes(
+        self,
+        upserts: Iterable[Mapping[str, Any]],
+        deleted_ids: Iterable[str],
+        *,
+        watermark_key: Optional[str] = None,
+        watermark: Optional[str] = None,
+    ) -> None:
+        """Merge a delta and optionally advance a sync watermark atomically."""
+        with self._lock, self._conn:
+            self._write_worklogs(upserts)
+            self._conn.executemany(
+                "DELETE FROM worklogs WHERE id = ?", [(str(i),) for i in deleted_ids]
+            )
+            if watermark_key is not None and watermark is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (key, watermark) VALUES (?, ?)",
+                    (watermark_key, watermark),
+                )
+
+    def max_updated_at(self, space_id: Optional[str] = None) -> Optional[str]:
+        sql = "SELECT MAX(updated_at) FROM worklogs"
+        args: list[Any] = []
+        if space_id is not None:
+            sql += " WHERE space_id = ?"
+            args.append(space_id)
+        with self._lock:
+            row = self._conn.execute(sql, args).fetchone()
+        return row[0] if row else None
+
+    def sync_watermark(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark FROM sync_state WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def iter_worklogs(self, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """Yield every cached worklog in batches, ordered by id."""
+        last_id = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, data FROM worklogs WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [json.loads(data) for _, data in rows]
+
+    def newest_record_time(self) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(record_time) FROM worklogs").fetchone()
+        return row[0] if row else None
+
+    # Tags and spaces ----------------------------------------------------
+
+    def upsert_tags(self, tags: Iterable[Mapping[str, Any]]) -> None:
+        rows = [
+            (str(tag["id"]), _text(tag.get("space_id")), json.dumps(tag))
+            for tag in tags
+            if tag.get("id") is not None
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tags (id, space_id, data) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def tags(self, space_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        sql = "SELECT data FROM tags"
+        args: list[Any] = []
+        if space_id is not None:
+            sql += " WHERE space_id = ?"
+            args.append(space_id)
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def upsert_spaces(self, spaces: Iterable[Mapping[str, Any]]) -> None:
+        rows = [
+            (str(space["id"]), _text(space.get("updated_at")), json.dumps(space))
+            for space in spaces
+            if space.get("id") is not None
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO spaces (id, updated_at, data) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def spaces(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM spaces").fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    # Owner --------------------------------------------------------------
+
+    def owner(self) -> Optional[str]:
+        """Return the id of the user whose data this is, if one is signed in."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'owner'").fetchone()
+        return row[0] if row else None
+
+    def set_owner(self, user_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('owner', ?)", (user_id,)
+            )
+
+    def clear(self) -> None:
+        """Remove all cached data and its owner, e.g. when the user signs out."""
+        with self._lock, self._conn:
+            for table in ("worklogs", "tags", "spaces", "sync_state", "mutations", "meta"):
+                self._conn.execute(f"DELETE FROM {table}")
+
+
+_store: Optional[WorklogStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> WorklogStore:
+    """Return the process-wide :class:`WorklogStore`."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = WorklogStore()
+        return _store
@@ -0,0 +1,157 @@
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, Mapping, Optional, Tuple
+
+from PySide6.QtCore import QCoreApplication, QThread
+from PySide6.QtGui import QFont, QGuiApplication, QTextDocument
+
+from .. import tracing
+
+# Widths are rounded down to a multiple of this, so small resizes reuse layouts.
+WIDTH_BUCKET_PX = 16
+# Estimated memory for rendered documents; least recently used ones go first.
+CACHE_MAX_BYTES = 16 * 1024 * 1024
+# Text width assumed before a card has been laid out (a 400 px DayCard less padding).
+DEFAULT_WIDTH_PX = 320
+# Matches the QLabel font size in style.qss.
+FONT_PIXEL_SIZE = 14
+
+# Per-document overhead plus a rough cost per character of laid-out text.
+_DOC_OVERHEAD_BYTES = 4096
+_BYTES_PER_CHAR = 16
+
+_Key = Tuple[str, int, int]
+
+
+class RenderedText:
+    """A Markdown document laid out at a fixed width."""
+
+    __slots__ = ("document", "width", "height", "size")
+
+    def __init__(self, document: QTextDocument, width: int, height: int, size: int):
+        self.document = document
+        self.width = width
+        self.height = height
+        self.size = size
+
+
+def content_of(worklog: Mapping[str, Any]) -> str:
+    return worklog.get("content") or "No content"
+
+
+class MarkdownRenderer:
+    """Renders worklog Markdown once and keeps the laid-out documents.
+
+    Entries are keyed by ``(worklog id, content hash, width bucket)``, so
+    an edit or a different width renders afresh while a rebuild of the
+    same month only looks documents up. The height is measured when the
+    document is rendered, so layouts never re-wrap the text.
+    :meth:`render_many` fills the cache from worker threads when the
+    platform supports threaded font rendering.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[_Key, RenderedText]" = OrderedDict()
+        self._bytes = 0
+        self._font = QFont()
+        self._font.setPixelSize(FONT_PIXEL_SIZE)
+        # The bucketed width cards were last shown at; used for prerendering.
+        self.preferred_width = self.bucket(DEFAULT_WIDTH_PX)
+
+    @staticmethod
+    def bucket(width: int) -> int:
+        return max(WIDTH_BUCKET_PX, width - width % WIDTH_BUCKET_PX)
+
+    @staticmethod
+    def key(worklog: Mapping[str, Any], width: int) -> _Key:
+        return (str(worklog.get("id")), hash(content_of(worklog)), MarkdownRenderer.bucket(width))
+
+    @property
+    def size(self) -> int:
+        return self._bytes
+
+    def get(self, worklog: Mapping[str, Any], width: int) -> RenderedText:
+        """Return ``worklog`` rendered for ``width``, rendering it on a miss."""
+        key = self.key(worklog, width)
+        with self._lock:
+            rendered = self._entries.get(key)
+            if rendered is not None:
+                self._entries.move_to_end(key)
+                return rendered
+        rendered = self._render(content_of(worklog), key[2])
+        self._store(key, rendered)
+        return rendered
+
+    def render_many(self, worklogs: Iterable[Mapping[str, Any]], width: Optional[int] = None) -> int:
+        """Render the uncached ``worklogs`` ahead of display; returns how many.
+
+        Safe on worker threads; nothing is rendered before the
+        :class:`QGuiApplication` exists.
+        """
+        width = self.bucket(width or self.preferred_width)
+        if not self._can_render_here():
+            return 0
+        keyed = [(self.key(worklog, width), worklog) for worklog in worklogs]
+        with self._lock:
+            todo = [(key, worklog) for key, worklog in keyed if key not in self._entries]
+        if not todo:
+            return 0
+        with tracing.span("render_markdown", "ui", docs=len(todo)):
+            for key, worklog in todo:
+                self._store(key, self._render(content_of(worklog), width))
+        return len(todo)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        tracing.gauge("markdown.cache_bytes", 0)
+
+    def _can_render_here(self) -> bool:
+        # Fonts need a QGuiApplication. Off the GUI thread this assumes the
+        # platform plugin supports threaded font rendering, as Qt 6's desktop
+        # plugins do; Qt only reports that capability to C++, not to Python.
+        return isinstance(QCoreApplication.instance(), QGuiApplication)
+
+    def _render(self, content: str, width: int) -> RenderedText:
+        document = QTextDocument()
+        document.setDefaultFont(self._font)
+        document.setDocumentMargin(0)
+        document.setMarkdown(content)
+        document.setTextWidth(width)
+        height = math.ceil(document.size().height())
+        app = QCoreApplication.instance()
+        if app is not None and QThread.currentThread() is not app.thread():
+            # Painted by the GUI thread from now on.
+            document.moveToThread(app.thread())
+        size = _DOC_OVERHEAD_BYTES + _BYTES_PER_CHAR * len(content)
+        return RenderedText(document, width, height, size)
+
+    def _store(self, key: _Key, rendered: RenderedText) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = rendered
+            self._bytes += rendered.size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+            size = self._bytes
+        tracing.gauge("markdown.cache_bytes", size)
+
+
+_renderer: Optional[MarkdownRenderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_markdown_renderer() -> MarkdownRenderer:
+    """Return the process-wide :class:`MarkdownRenderer`."""
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = MarkdownRenderer()
+        return _renderer
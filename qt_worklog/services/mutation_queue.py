@@ -0,0 +1,295 @@
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QThreadPool, QTimer, Signal, Slot
+
+from . import api_client
+from .local_store import WorklogStore, get_store
+from .workers import Worker
+
+# Concurrent PATCH/DELETE requests per flush.
+FLUSH_CONCURRENCY = 4
+# Mutations sent per flush; the rest wait for the next one.
+FLUSH_BATCH_SIZE = 50
+# Exponential back-off for 5xx and network errors (SPEC §5.3).
+BACKOFF_BASE_S = 2.0
+BACKOFF_MAX_S = 300.0
+
+UPDATE = "update"
+DELETE = "delete"
+
+# Outcome statuses returned by flush_due().
+APPLIED = "applied"
+RETRY = "retry"
+FAILED = "failed"
+AUTH = "auth"
+
+
+class MutationJournal:
+    """Durable, coalescing queue of worklog writes kept in the local store.
+
+    Each worklog id has at most one pending row: repeated edits merge into
+    one PATCH and a delete replaces any pending edit. ``version`` bumps on
+    every enqueue so a write that races an in-flight send is not lost.
+    """
+
+    def __init__(self, store: Optional[WorklogStore] = None):
+        self.store = store or get_store()
+
+    def enqueue_update(self, worklog_id: str, fields: Dict[str, Any]) -> None:
+        with self.store.transaction() as conn:
+            row = conn.execute(
+                "SELECT op, payload FROM mutations WHERE worklog_id = ?",
+                (str(worklog_id),),
+            ).fetchone()
+            if row is not None and row[0] == DELETE:
+                return
+            payload = json.loads(row[1]) if row is not None else {}
+            payload.update(fields)
+            self._write(conn, worklog_id, UPDATE, payload)
+
+    def enqueue_delete(self, worklog_id: str) -> None:
+        with self.store.transaction() as conn:
+            self._write(conn, worklog_id, DELETE, None)
+
+    @staticmethod
+    def _write(conn, worklog_id: str, op: str, payload: Optional[Dict[str, Any]]) -> None:
+        conn.execute(
+            "INSERT INTO mutations (worklog_id, op, payload, version, attempts, next_attempt_at)"
+            " VALUES (?, ?, ?, 1, 0, 0)"
+            " ON CONFLICT (worklog_id) DO UPDATE SET op = excluded.op,"
+            " payload = excluded.payload, version = version + 1,"
+            " attempts = 0, next_attempt_at = 0",
+            (str(worklog_id), op, json.dumps(payload) if payload is not None else None),
+        )
+
+    def pending(self, worklog_id: str) -> Optional[Tuple[str, Optional[Dict[str, Any]]]]:
+        with self.store.transaction() as conn:
+            row = conn.execute(
+                "SELECT op, payload FROM mutations WHERE worklog_id = ?",
+                (str(worklog_id),),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]) if row[1] else None
+
+    def pending_all(self) -> Dict[str, Tuple[str, Optional[Dict[str, Any]]]]:
+        with self.store.transaction() as conn:
+            rows = conn.execute("SELECT worklog_id, op, payload FROM mutations").fetchall()
+        return {wid: (op, json.loads(payload) if payload else None) for wid, op, payload in rows}
+
+    def overlay(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return server ``records`` with still-pending local writes applied.
+
+        Keeps a fetch or sync from briefly reverting an optimistic edit.
+        """
+        pending = self.pending_all()
+        if not pending:
+            return records
+        result = []
+        for rec in records:
+            op, payload = pending.get(str(rec.get("id")), (None, None))
+            if op == DELETE:
+                continue
+            if op == UPDATE:
+                rec = {**rec, **payload}
+            result.append(rec)
+        return result
+
+    def due(self, now: float, limit: int = FLUSH_BATCH_SIZE) -> List[Tuple[str, str, Any, int, int]]:
+        """Return ``(worklog_id, op, payload, version, attempts)`` rows ready to send."""
+        with self.store.transaction() as conn:
+            rows = conn.execute(
+                "SELECT worklog_id, op, payload, version, attempts FROM mutations"
+                " WHERE next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                (now, limit),
+            ).fetchall()
+        return [
+            (wid, op, json.loads(payload) if payload else None, version, attempts)
+            for wid, op, payload, version, attempts in rows
+        ]
+
+    def next_due_at(self) -> Optional[float]:
+        with self.store.transaction() as conn:
+            row = conn.execute("SELECT MIN(next_attempt_at) FROM mutations").fetchone()
+        return row[0] if row else None
+
+    def count(self) -> int:
+        with self.store.transaction() as conn:
+            return conn.execute("SELECT COUNT(*) FROM mutations").fetchone()[0]
+
+    def complete(self, worklog_id: str, version: int) -> bool:
+        """Drop a sent mutation unless it was re-enqueued meanwhile.
+
+        Returns whether the row was dropped, i.e. nothing newer is pending.
+        """
+        with self.store.transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM mutations WHERE worklog_id = ? AND version = ?",
+                (worklog_id, version),
+            )
+            return cursor.rowcount > 0
+
+    def reschedule(self, worklog_id: str, version: int, attempts: int) -> None:
+        delay = min(BACKOFF_MAX_S, BACKOFF_BASE_S * 2 ** attempts)
+        delay *= random.uniform(0.5, 1.5)
+        with self.store.transaction() as conn:
+            conn.execute(
+                "UPDATE mutations SET attempts = ?, next_attempt_at = ?"
+                " WHERE worklog_id = ? AND version = ?",
+                (attempts + 1, time.time() + delay, worklog_id, version),
+            )
+
+
+def _send(token: str, op: str, worklog_id: str, payload: Optional[Dict[str, Any]], sign_out) -> None:
+    if op == DELETE:
+        api_client.delete_worklog(token, worklog_id, sign_out=sign_out)
+    else:
+        api_client.update_worklog(token, worklog_id, sign_out=sign_out, **payload)
+
+
+def _classify(op: str, error: Exception) -> str:
+    import requests
+
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return RETRY
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        if status in (401, 403):
+            return AUTH
+        if status == 404 and op == DELETE:
+            return APPLIED
+        if status >= 500 or status == 429:
+            return RETRY
+    return FAILED
+
+
+def flush_due(
+    token: str,
+    journal: Optional[MutationJournal] = None,
+    *,
+    sign_out=None,
+) -> List[Tuple[str, str, str, str, bool]]:
+    """Send due mutations concurrently.
+
+    Returns ``(id, op, status, message, settled)``; ``settled`` is false
+    while a newer write of the same worklog is still queued.
+    """
+    journal = journal or MutationJournal()
+    batch = journal.due(time.time())
+    if not batch:
+        return []
+
+    def run(item):
+        worklog_id, op, payload, version, attempts = item
+        try:
+            _send(token, op, worklog_id, payload, sign_out)
+        except Exception as e:
+            status = _classify(op, e)
+            if status in (RETRY, AUTH):
+                journal.reschedule(worklog_id, version, attempts)
+                settled = False
+            else:
+                settled = journal.complete(worklog_id, version)
+            return worklog_id, op, status, str(e), settled
+        settled = journal.complete(worklog_id, version)
+        return worklog_id, op, APPLIED, "", settled
+
+    with ThreadPoolExecutor(max_workers=FLUSH_CONCURRENCY) as pool:
+        return list(pool.map(run, batch))
+
+
+class MutationQueue(QObject):
+    """Qt front end of :class:`MutationJournal`; flushes off the GUI thread."""
+
+    # (worklog_id, op[, message], settled): settled is false while a newer
+    # write of the same worklog is still queued.
+    applied = Signal(str, str, bool)
+    failed = Signal(str, str, str, bool)
+    pending_changed = Signal(int)
+    auth_failed = Signal()
+
+    def __init__(self, token_manager, store: Optional[WorklogStore] = None, parent: QObject | None = None):
+        super().__init__(parent)
+        self.token_manager = token_manager
+        self.journal = MutationJournal(store)
+        # Set until the flush in flight reports back, even across stop().
+        self._worker: Worker | None = None
+        self._stopped = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def enqueue_update(self, worklog_id: str, *, content: str, record_time: str, tag_id: str = None) -> None:
+        fields: Dict[str, Any] = {"content": content, "record_time": record_time}
+        if tag_id:
+            fields["tag_id"] = tag_id
+        self.journal.enqueue_update(worklog_id, fields)
+        self._queued()
+
+    def enqueue_delete(self, worklog_id: str) -> None:
+        self.journal.enqueue_delete(worklog_id)
+        self._queued()
+
+    def _queued(self) -> None:
+        self.pending_changed.emit(self.journal.count())
+        # Batch bursts of edits into one flush.
+        if not self._timer.isActive() or self._timer.remainingTime() > 500:
+            self._timer.start(500)
+
+    @Slot()
+    def flush(self) -> None:
+        self._stopped = False
+        if self._worker is not None:
+            return
+        token = self.token_manager.get_token()
+        if not token:
+            return
+        self._worker = Worker(0, flush_due, token, self.journal)
+        self._worker.signals.finished.connect(self._on_flushed)
+        self._worker.signals.failed.connect(self._on_flush_error)
+        QThreadPool.globalInstance().start(self._worker)
+
+    def stop(self) -> None:
+        """Stop flushing; a flush in flight finishes but is not reported.
+
+        The worker is kept until it reports back, so a later :meth:`flush`
+        cannot send the same rows a second time.
+        """
+        self._timer.stop()
+        self._stopped = True
+
+    @Slot(int, object)
+    def _on_flushed(self, _generation: int, outcomes) -> None:
+        self._worker = None
+        if self._stopped:
+            return
+        auth = False
+        for worklog_id, op, status, message, settled in outcomes:
+            if status == APPLIED:
+                self.applied.emit(worklog_id, op, settled)
+            elif status == FAILED:
+                self.failed.emit(worklog_id, op, message, settled)
+            elif status == AUTH:
+                auth = True
+        self.pending_changed.emit(self.journal.count())
+        if auth:
+            self.auth_failed.emit()
+            return
+        self._schedule_next()
+
+    @Slot(int, object)
+    def _on_flush_error(self, _generation: int, _error) -> None:
+        self._worker = None
+        if not self._stopped:
+            self._schedule_next()
+
+    def _schedule_next(self) -> None:
+        next_at = self.journal.next_due_at()
+        if next_at is None:
+            return
+        delay = max(0.0, next_at - time.time())
+        self._timer.start(int(delay * 1000))
@@ -0,0 +1,227 @@
+import bisect
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+from .workers import FetchPipeline
+
+# SPEC §5.3: Ctrl+F search is debounced by 300 ms.
+SEARCH_DEBOUNCE_MS = 300
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# Han, kana, Hangul and CJK compatibility ideographs: scripts without spaces.
+_CJK_RE = re.compile(
+    r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+"
+)
+
+
+def _split_word(word: str) -> Iterable[Tuple[bool, str]]:
+    """Yield ``(is_cjk, run)`` pieces of a single ``\\w+`` match."""
+    pos = 0
+    for m in _CJK_RE.finditer(word):
+        if m.start() > pos:
+            yield False, word[pos:m.start()]
+        yield True, m.group()
+        pos = m.end()
+    if pos < len(word):
+        yield False, word[pos:]
+
+
+def tokenize(text: str) -> List[str]:
+    """Index terms for ``text``: lowercase words plus CJK unigrams and bigrams."""
+    terms: List[str] = []
+    for word in _WORD_RE.findall(text.lower()):
+        for is_cjk, run in _split_word(word):
+            if not is_cjk:
+                terms.append(run)
+                continue
+            terms.extend(run)
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return terms
+
+
+def query_terms(query: str) -> Tuple[List[str], Optional[str]]:
+    """Split a query into exact terms and an optional trailing prefix term.
+
+    CJK runs become bigrams (or a unigram for a single character) so every
+    piece must occur in the document. The last Latin word is matched as a
+    prefix, which is what as-you-type search needs.
+    """
+    exact: List[str] = []
+    prefix: Optional[str] = None
+    words = _WORD_RE.findall(query.lower())
+    for w_index, word in enumerate(words):
+        pieces = list(_split_word(word))
+        for p_index, (is_cjk, run) in enumerate(pieces):
+            if is_cjk:
+                if len(run) == 1:
+                    exact.append(run)
+                else:
+                    exact.extend(run[i:i + 2] for i in range(len(run) - 1))
+            elif w_index == len(words) - 1 and p_index == len(pieces) - 1 and not query[-1:].isspace():
+                prefix = run
+            else:
+                exact.append(run)
+    return exact, prefix
+
+
+class SearchIndex:
+    """Incremental inverted index over worklog ``content``.
+
+    Thread-safe: it is filled from worker threads and queried from the
+    search pipeline.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._vocab: List[str] = []
+        self._vocab_dirty = False
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def add(self, logs: Iterable[Mapping[str, Any]]) -> None:
+        with self._lock:
+            for rec in logs:
+                doc_id = str(rec.get("id"))
+                self._remove_doc(doc_id)
+                counts = Counter(tokenize(str(rec.get("content") or "")))
+                self._doc_terms[doc_id] = counts
+                for term, tf in counts.items():
+                    posting = self._postings.get(term)
+                    if posting is None:
+                        posting = self._postings[term] = {}
+                        self._vocab_dirty = True
+                    posting[doc_id] = tf
+
+    def remove(self, ids: Iterable[str]) -> None:
+        with self._lock:
+            for doc_id in ids:
+                self._remove_doc(str(doc_id))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._vocab = []
+            self._vocab_dirty = False
+
+    def _remove_doc(self, doc_id: str) -> None:
+        counts = self._doc_terms.pop(doc_id, None)
+        if not counts:
+            return
+        for term in counts:
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(doc_id, None)
+            if not posting:
+                del self._postings[term]
+                self._vocab_dirty = True
+
+    def _prefix_terms(self, prefix: str) -> List[str]:
+        if self._vocab_dirty:
+            self._vocab = sorted(self._postings)
+            self._vocab_dirty = False
+        start = bisect.bisect_left(self._vocab, prefix)
+        end = bisect.bisect_left(self._vocab, prefix + "\U0010ffff")
+        return self._vocab[start:end]
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Return ids of worklogs matching every query term, best first."""
+        exact, prefix = query_terms(query)
+        if not exact and not prefix:
+            return []
+        with self._lock:
+            n_docs = len(self._doc_terms) or 1
+            # Each group is one query term: doc -> (tf, idf).
+            groups: List[Dict[str, float]] = []
+            for term in dict.fromkeys(exact):
+                posting = self._postings.get(term)
+                if not posting:
+                    return []
+                idf = math.log(1 + n_docs / len(posting))
+                groups.append({doc: tf * idf for doc, tf in posting.items()})
+            if prefix:
+                merged: Dict[str, float] = {}
+                for term in self._prefix_terms(prefix):
+                    posting = self._postings[term]
+                    idf = math.log(1 + n_docs / len(posting))
+                    for doc, tf in posting.items():
+                        merged[doc] = max(merged.get(doc, 0.0), tf * idf)
+                if not merged:
+                    return []
+                groups.append(merged)
+
+        groups.sort(key=len)
+        scores = dict(groups[0])
+        for group in groups[1:]:
+            scores = {doc: s + group[doc] for doc, s in scores.items() if doc in group}
+            if not scores:
+                return []
+        ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+        return ranked[:limit] if limit else ranked
+
+
+_index = SearchIndex()
+
+
+def get_search_index() -> SearchIndex:
+    return _index
+
+
+class SearchController(QObject):
+    """Debounced background search; superseded keystrokes are dropped."""
+
+    results_ready = Signal(str, list)
+    cleared = Signal()
+
+    def __init__(self, index: Optional[SearchIndex] = None, parent: QObject | None = None):
+        super().__init__(parent)
+        self.index = index or get_search_index()
+        self._query = ""
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._timer.timeout.connect(self._run)
+        self._pipeline = FetchPipeline(self)
+        self._pipeline.finished.connect(self._on_results)
+
+    @property
+    def query(self) -> str:
+        return self._query
+
+    @Slot(str)
+    def set_query(self, text: str) -> None:
+        # Kept unstripped: a trailing space ends the prefix word.
+        self._query = text
+        if not text.strip():
+            self._timer.stop()
+            self._pipeline.cancel()
+            self.cleared.emit()
+            return
+        self._timer.start()
+
+    def rerun(self) -> None:
+        """Search again, e.g. after the index changed."""
+        if self._query.strip():
+            self._run()
+
+    @Slot()
+    def _run(self) -> None:
+        query = self._query
+        self._pipeline.submit(
+            lambda: (query, self.index.search(query)), pass_sign_out=False
+        )
+
+    @Slot(object)
+    def _on_results(self, result) -> None:
+        query, ids = result
+        if query == self._query:
+            self.results_ready.emit(query, ids)
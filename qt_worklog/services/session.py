@@ -0,0 +1,40 @@
+from typing import Optional
+
+from ..models.tag_filter import get_tag_index
+from .auth.tokens import token_user_id
+from .http_cache import get_response_cache
+from .local_store import get_store
+from .markdown_render import get_markdown_renderer
+from .search_index import get_search_index
+
+
+def clear_session_data() -> None:
+    """Forget everything cached for the signed-in user.
+
+    Wipes the local store (worklogs, tags, spaces, sync watermarks and
+    pending mutations), the HTTP response cache, the search and tag
+    indexes and the rendered Markdown. Called whenever the credentials go
+    away, so the next account never sees or replays this one's data.
+    """
+    get_store().clear()
+    get_response_cache().clear()
+    get_search_index().clear()
+    get_tag_index().clear()
+    get_markdown_renderer().clear()
+
+
+def claim_session(token: Optional[str]) -> None:
+    """Tie the local data to the user of ``token``, wiping anyone else's."""
+    user_id = token_user_id(token)
+    if not user_id:
+        return
+    store = get_store()
+    if store.owner() != user_id:
+        # Unowned data may be left over from a session that ended mid-write.
+        clear_session_data()
+        store.set_owner(user_id)
+
+
+def has_session_data() -> bool:
+    """Whether the local data belongs to a session that is still signed in."""
+    return get_store().owner() is not None
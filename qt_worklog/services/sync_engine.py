@@ -0,0 +1,140 @@
+import datetime as _dt
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+from . import api_client
+from .local_store import WorklogStore, get_store
+from .mutation_queue import MutationJournal
+from .workers import FetchPipeline
+
+# SPEC §6: the sync engine runs every 30 s or when connectivity returns.
+SYNC_INTERVAL_MS = 30 * 1000
+
+# Watermark key used for logs that do not carry a space id.
+ALL_SPACES = "*"
+
+
+def _is_tombstone(rec: Mapping[str, Any]) -> bool:
+    return bool(rec.get("deleted") or rec.get("is_deleted") or rec.get("deleted_at"))
+
+
+def _instant(value: Any) -> Optional[_dt.datetime]:
+    """Parse an ``updated_at`` timestamp; naive values are taken as UTC."""
+    try:
+        parsed = _dt.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=_dt.timezone.utc)
+
+
+def _latest(watermark: str, stamps: Iterable[Any]) -> str:
+    """Return the newest of ``watermark`` and ``stamps``, compared as instants.
+
+    Text order breaks on ``Z`` versus ``+00:00``, other offsets and varying
+    fractional digits. The winner is returned as the server wrote it.
+    """
+    best, best_at = watermark, _instant(watermark)
+    for stamp in stamps:
+        at = _instant(stamp)
+        if at is not None and (best_at is None or at > best_at):
+            best, best_at = str(stamp), at
+    return best
+
+
+def sync_once(
+    token: str,
+    store: Optional[WorklogStore] = None,
+    *,
+    sign_out: Optional[Callable[[], None]] = None,
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Pull worklogs changed since each space's watermark into ``store``.
+
+    Returns ``(changed, deleted_ids)``. Spaces with no watermark and nothing
+    cached are skipped, since the month view fetches them in full anyway.
+    """
+    store = store or get_store()
+    journal = MutationJournal(store)
+    space_ids = [space["id"] for space in store.spaces()] or [None]
+    changed: List[Dict[str, Any]] = []
+    deleted: List[str] = []
+    for space_id in space_ids:
+        key = ALL_SPACES if space_id is None else str(space_id)
+        watermark = store.sync_watermark(key) or store.max_updated_at(space_id)
+        if watermark is None:
+            continue
+        params: Dict[str, Any] = {"updated_since": watermark, "include_deleted": "true"}
+        if space_id is not None:
+            params["space_id"] = space_id
+        for page in api_client.iter_worklog_pages(
+            token, sign_out=sign_out, cache=False, **params
+        ):
+            upserts = journal.overlay([rec for rec in page if not _is_tombstone(rec)])
+            removed = [str(rec["id"]) for rec in page if _is_tombstone(rec)]
+            watermark = _latest(
+                watermark, (rec["updated_at"] for rec in page if rec.get("updated_at"))
+            )
+            store.apply_changes(
+                upserts, removed, watermark_key=key, watermark=watermark
+            )
+            changed.extend(upserts)
+            deleted.extend(removed)
+    return changed, deleted
+
+
+class SyncEngine(QObject):
+    """Periodically merges server-side worklog changes into the local store."""
+
+    worklogs_changed = Signal(list, list)
+    auth_failed = Signal()
+
+    def __init__(self, token_manager, parent: QObject | None = None):
+        super().__init__(parent)
+        self.token_manager = token_manager
+        self._pipeline = FetchPipeline(self)
+        self._pipeline.finished.connect(self._on_synced)
+        self._pipeline.auth_failed.connect(self.auth_failed)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(SYNC_INTERVAL_MS)
+        self._timer.timeout.connect(self.sync_now)
+
+        self._network = None
+        try:
+            from PySide6.QtNetwork import QNetworkInformation
+
+            if QNetworkInformation.loadDefaultBackend():
+                self._network = QNetworkInformation.instance()
+                self._network.reachabilityChanged.connect(self._on_reachability_changed)
+        except ImportError:
+            pass
+
+    def start(self) -> None:
+        self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self._pipeline.cancel()
+
+    @Slot()
+    def sync_now(self) -> None:
+        """Start a sync unless one is already running."""
+        if self._pipeline.busy:
+            return
+        token = self.token_manager.get_token()
+        if not token:
+            return
+        self._pipeline.submit(sync_once, token)
+
+    @Slot(object)
+    def _on_reachability_changed(self, reachability) -> None:
+        from PySide6.QtNetwork import QNetworkInformation
+
+        if reachability == QNetworkInformation.Reachability.Online and self._timer.isActive():
+            self.sync_now()
+
+    @Slot(object)
+    def _on_synced(self, result) -> None:
+        changed, deleted = result
+        if changed or deleted:
+            self.worklogs_changed.emit(changed, deleted)
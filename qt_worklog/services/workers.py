@@ -0,0 +1,171 @@
+import threading
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+
+class WorkerCancelled(Exception):
+    """Raised by :meth:`Worker.report` to stop a task that was cancelled."""
+
+
+class WorkerSignals(QObject):
+    """Signals emitted by :class:`Worker`; delivered queued to the GUI thread."""
+
+    finished = Signal(int, object)
+    failed = Signal(int, object)
+    auth_failed = Signal(int)
+    progress = Signal(int, object)
+
+
+class Worker(QRunnable):
+    """Run ``fn(*args, **kwargs)`` on a ``QThreadPool`` thread.
+
+    ``generation`` tags every emitted signal so the owner can ignore results
+    from requests that were superseded while in flight.
+    """
+
+    def __init__(self, generation: int, fn: Callable[..., Any], *args: Any, **kwargs: Any):
+        super().__init__()
+        self.generation = generation
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    def sign_out(self) -> None:
+        """``sign_out`` callback safe to call from the worker thread."""
+        self.signals.auth_failed.emit(self.generation)
+
+    def report(self, value: Any) -> None:
+        """``progress`` callback: hand a partial result to the GUI thread.
+
+        Raises :class:`WorkerCancelled` once cancelled, so streaming tasks
+        stop downloading as soon as nobody wants the rest.
+        """
+        if self.cancelled.is_set():
+            raise WorkerCancelled()
+        self.signals.progress.emit(self.generation, value)
+
+    @Slot()
+    def run(self) -> None:
+        if self.cancelled.is_set():
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            if not self.cancelled.is_set():
+                self.signals.failed.emit(self.generation, e)
+            return
+        if not self.cancelled.is_set():
+            self.signals.finished.emit(self.generation, result)
+
+
+class FetchPipeline(QObject):
+    """Latest-wins background task runner.
+
+    Submitting a new task cancels the one in flight; results of cancelled
+    tasks are dropped instead of reaching the UI.
+    """
+
+    started = Signal(str)
+    progress = Signal(object)
+    finished = Signal(object)
+    failed = Signal(object)
+    auth_failed = Signal()
+    busy_changed = Signal(bool)
+
+    def __init__(self, parent: QObject | None = None, pool: QThreadPool | None = None):
+        super().__init__(parent)
+        self._pool = pool or QThreadPool.globalInstance()
+        self._generation = 0
+        self._current: Worker | None = None
+
+    @property
+    def busy(self) -> bool:
+        return self._current is not None
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        message: str = "",
+        pass_sign_out: bool = True,
+        pass_progress: bool = False,
+        **kwargs: Any,
+    ) -> int:
+        """Queue ``fn`` and return its generation number.
+
+        When ``pass_sign_out`` is true, ``fn`` receives a thread-safe
+        ``sign_out`` keyword that surfaces as :attr:`auth_failed`. With
+        ``pass_progress``, it also receives a ``progress`` callback whose
+        values surface as :attr:`progress` while the task is current.
+        """
+        self._cancel_current()
+        self._generation += 1
+        worker = Worker(self._generation, fn, *args, **kwargs)
+        if pass_sign_out:
+            worker.kwargs["sign_out"] = worker.sign_out
+        if pass_progress:
+            worker.kwargs["progress"] = worker.report
+            worker.signals.progress.connect(self._on_progress)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.failed.connect(self._on_failed)
+        worker.signals.auth_failed.connect(self._on_auth_failed)
+        was_busy = self.busy
+        self._current = worker
+        self._pool.start(worker)
+        self.started.emit(message)
+        if not was_busy:
+            self.busy_changed.emit(True)
+        return self._generation
+
+    def cancel(self) -> None:
+        """Drop the in-flight task, if any."""
+        if self._cancel_current():
+            self.busy_changed.emit(False)
+
+    def _cancel_current(self) -> bool:
+        worker = self._current
+        if worker is None:
+            return False
+        worker.cancel()
+        self._current = None
+        return True
+
+    def _is_current(self, generation: int) -> bool:
+        return self._current is not None and self._current.generation == generation
+
+    def _done(self) -> None:
+        self._current = None
+        self.busy_changed.emit(False)
+
+    @Slot(int, object)
+    def _on_progress(self, generation: int, value: Any) -> None:
+        if self._is_current(generation):
+            self.progress.emit(value)
+
+    @Slot(int, object)
+    def _on_finished(self, generation: int, result: Any) -> None:
+        if not self._is_current(generation):
+            return
+        self._done()
+        self.finished.emit(result)
+
+    @Slot(int, object)
+    def _on_failed(self, generation: int, error: Exception) -> None:
+        if not self._is_current(generation):
+            return
+        self._done()
+        self.failed.emit(error)
+
+    @Slot(int)
+    def _on_auth_failed(self, generation: int) -> None:
+        if not self._is_current(generation):
+            return
+        self._current.cancel()
+        self._done()
+        self.auth_failed.emit()
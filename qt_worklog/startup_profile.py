@@ -0,0 +1,72 @@
+import sys
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+# Modules that should not be loaded before the first paint.
+DEFERRED_MODULES = ("requests", "google_auth_oauthlib", "google.auth", "secretstorage")
+
+
+class StartupProfile:
+    """Per-phase wall-clock and import timings for ``--profile-startup``.
+
+    Each :meth:`phase` records its duration and how many modules it
+    imported; the report is printed to stderr once the first window paints.
+    A disabled profile costs nothing beyond the context manager call.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self.phases: List[Tuple[str, float, int]] = []
+        self.reported = False
+        self._modules_at_start = len(sys.modules)
+        self._filter = None
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled or self.reported:
+            yield
+            return
+        modules = len(sys.modules)
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append(
+                (name, time.perf_counter() - begin, len(sys.modules) - modules)
+            )
+
+    def watch_first_paint(self, widget) -> None:
+        """Report as soon as ``widget`` receives its first paint event."""
+        if not self.enabled or self.reported or self._filter is not None:
+            return
+        from PySide6.QtCore import QEvent, QObject
+
+        profile = self
+
+        class _FirstPaint(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Paint and not profile.reported:
+                    obj.removeEventFilter(self)
+                    profile.report()
+                return False
+
+        self._filter = _FirstPaint(widget)
+        widget.installEventFilter(self._filter)
+
+    def report(self, stream=None) -> None:
+        stream = stream or sys.stderr
+        self.reported = True
+        total = time.perf_counter() - self.start
+        print("Startup profile (ms, modules imported):", file=stream)
+        for name, seconds, modules in self.phases:
+            print(f"  {name:<24} {seconds * 1000:8.1f}  {modules:5d}", file=stream)
+        print(
+            f"  {'first paint':<24} {total * 1000:8.1f}"
+            f"  {len(sys.modules) - self._modules_at_start:5d}",
+            file=stream,
+        )
+        loaded = [name for name in DEFERRED_MODULES if name in sys.modules]
+        if loaded:
+            print(f"  loaded before first paint: {', '.join(loaded)}", file=stream)
@@ -0,0 +1,165 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Completed spans kept for the overlay and the Chrome trace export.
+MAX_SPANS = 20000
+# Spans slower than this are logged at INFO instead of DEBUG.
+SLOW_SPAN_MS = 100.0
+# Window summarised by the status-bar panel.
+SUMMARY_WINDOW_S = 10.0
+
+
+class Span:
+    """One completed timing span; times are ``perf_counter_ns`` values."""
+
+    __slots__ = ("name", "cat", "start_ns", "dur_ns", "tid", "args")
+
+    def __init__(self, name: str, cat: str, start_ns: int, dur_ns: int, tid: int, args: Dict[str, Any]):
+        self.name = name
+        self.cat = cat
+        self.start_ns = start_ns
+        self.dur_ns = dur_ns
+        self.tid = tid
+        self.args = args
+
+    @property
+    def ms(self) -> float:
+        return self.dur_ns / 1e6
+
+
+class Tracer:
+    """Thread-safe recorder of timing spans, counters and gauges.
+
+    Recording is an append to a bounded deque, cheap enough for hot paths.
+    Every span is also logged, so a user log alone tells network time from
+    UI time; the ring buffer feeds the overlay and the trace export.
+    """
+
+    def __init__(self, max_spans: int = MAX_SPANS):
+        self._lock = threading.Lock()
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._counters: Dict[str, float] = {}
+        # (name, perf_counter_ns, value) counter samples for the trace export.
+        self._samples: Deque[Tuple[str, int, float]] = deque(maxlen=max_spans)
+        self.enabled = True
+
+    @contextmanager
+    def span(self, name: str, cat: str = "app", **args: Any) -> Iterator[Dict[str, Any]]:
+        """Time the ``with`` block; the yielded dict collects extra fields."""
+        if not self.enabled:
+            yield args
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield args
+        except BaseException as e:
+            args["error"] = type(e).__name__
+            raise
+        finally:
+            span = Span(name, cat, start, time.perf_counter_ns() - start, threading.get_ident(), args)
+            with self._lock:
+                self._spans.append(span)
+            level = logging.INFO if span.ms >= SLOW_SPAN_MS else logging.DEBUG
+            if logger.isEnabledFor(level):
+                fields = " ".join(f"{k}={v}" for k, v in args.items())
+                logger.log(level, "%s %s %.1f ms %s", cat, name, span.ms, fields)
+
+    def count(self, name: str, delta: float = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            value = self._counters[name] = self._counters.get(name, 0) + delta
+            self._samples.append((name, time.perf_counter_ns(), value))
+
+    def gauge(self, name: str, value: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = value
+            self._samples.append((name, time.perf_counter_ns(), value))
+
+    def counters(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._counters)
+
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def recent(self, window_s: float = SUMMARY_WINDOW_S) -> Dict[str, Dict[str, float]]:
+        """Per-category ``count``/``ms``/``max_ms``/``bytes`` over the last ``window_s``."""
+        since = time.perf_counter_ns() - int(window_s * 1e9)
+        summary: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            spans = [s for s in self._spans if s.start_ns >= since]
+        for s in spans:
+            entry = summary.setdefault(s.cat, {"count": 0, "ms": 0.0, "max_ms": 0.0, "bytes": 0})
+            entry["count"] += 1
+            entry["ms"] += s.ms
+            entry["max_ms"] = max(entry["max_ms"], s.ms)
+            entry["bytes"] += s.args.get("bytes") or 0
+        return summary
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._samples.clear()
+            self._counters.clear()
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Return the recorded data in Chrome's Trace Event format."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self._spans)
+            samples = list(self._samples)
+        events: List[Dict[str, Any]] = [
+            {
+                "name": s.name,
+                "cat": s.cat,
+                "ph": "X",
+                "ts": s.start_ns / 1000,
+                "dur": s.dur_ns / 1000,
+                "pid": pid,
+                "tid": s.tid,
+                "args": {k: v if isinstance(v, (int, float, bool)) else str(v) for k, v in s.args.items()},
+            }
+            for s in spans
+        ]
+        events.extend(
+            {"name": name, "ph": "C", "ts": ts / 1000, "pid": pid, "args": {"value": value}}
+            for name, ts, value in samples
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: Path) -> None:
+        """Write a file that chrome://tracing or Perfetto can open."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def span(name: str, cat: str = "app", **args: Any):
+    return _tracer.span(name, cat, **args)
+
+
+def count(name: str, delta: float = 1) -> None:
+    _tracer.count(name, delta)
+
+
+def gauge(name: str, value: float) -> None:
+    _tracer.gauge(name, value)
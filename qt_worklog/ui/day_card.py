@@ -12,12 +12,52 @@ class DayCard(QWidget):
         self.layout = QVBoxLayout()
         self.layout.setSpacing(10)
 
-        date_label = QLabel(f"<b>{date_str}</b>")
-        self.layout.addWidget(date_label)
+        self.date_label = QLabel(f"<b>{date_str}</b>")
+        self.layout.addWidget(self.date_label)
 
         self.setLayout(self.layout)
         self.setObjectName("DayCard")
         self.setAttribute(Qt.WA_StyledBackground, True)
 
+        # Worklog id -> card, in display order.
+        self.cards = {}
+
+    def set_date(self, date_str):
+        text = f"<b>{date_str}</b>"
+        if self.date_label.text() != text:
+            self.date_label.setText(text)
+
     def add_worklog_card(self, card):
         self.layout.addWidget(card)
+
+    def reconcile(self, worklogs, acquire_card, release_card):
+        """Make the cards match ``worklogs``, reusing cards by worklog id.
+
+        ``acquire_card(worklog)`` supplies a card for a new id and
+        ``release_card(card)`` takes back one that is no longer shown.
+        """
+        wanted = {str(log.get("id")): log for log in worklogs}
+        for worklog_id in [i for i in self.cards if i not in wanted]:
+            card = self.cards.pop(worklog_id)
+            self.layout.removeWidget(card)
+            release_card(card)
+
+        cards = {}
+        for pos, (worklog_id, log) in enumerate(wanted.items(), start=1):
+            card = self.cards.get(worklog_id)
+            if card is None:
+                card = acquire_card(log)
+            else:
+                card.set_worklog(log)
+            if self.layout.indexOf(card) != pos:
+                self.layout.removeWidget(card)
+                self.layout.insertWidget(pos, card)
+            card.show()
+            cards[worklog_id] = card
+        self.cards = cards
+
+    def release_all(self, release_card):
+        for card in self.cards.values():
+            self.layout.removeWidget(card)
+            release_card(card)
+        self.cards = {}
@@ -1,6 +1,8 @@
 from PySide6.QtCore import Qt, QPoint, QRect, QSize, QMargins
 from PySide6.QtWidgets import QLayout, QSizePolicy, QWidgetItem
 
+from .. import tracing
+
 
 class FlowLayout(QLayout):
     def __init__(self, parent=None, margin=0, spacing=-1):
@@ -12,6 +14,10 @@ class FlowLayout(QLayout):
         self.setSpacing(spacing)
 
         self._item_list = []
+        # Per-item (size hint, space_x, space_y), rebuilt lazily after invalidate().
+        self._metrics = None
+        self._height_for_width = {}
+        self._laid_out_rect = None
 
     def __del__(self):
         item = self.takeAt(0)
@@ -20,6 +26,21 @@ class FlowLayout(QLayout):
 
     def addItem(self, item):
         self._item_list.append(item)
+        self._clear_cache()
+
+    def insertWidget(self, index, widget):
+        self.addChildWidget(widget)
+        self._item_list.insert(index, QWidgetItem(widget))
+        self.invalidate()
+
+    def invalidate(self):
+        self._clear_cache()
+        super().invalidate()
+
+    def _clear_cache(self):
+        self._metrics = None
+        self._height_for_width = {}
+        self._laid_out_rect = None
 
     def count(self):
         return len(self._item_list)
@@ -31,6 +52,7 @@ class FlowLayout(QLayout):
 
     def takeAt(self, index):
         if 0 <= index < len(self._item_list):
+            self._clear_cache()
             return self._item_list.pop(index)
         return None
 
@@ -41,11 +63,18 @@ class FlowLayout(QLayout):
         return True
 
     def heightForWidth(self, width):
-        return self._do_layout(QRect(0, 0, width, 0), True)
+        height = self._height_for_width.get(width)
+        if height is None:
+            height = self._do_layout(QRect(0, 0, width, 0), True)
+            self._height_for_width[width] = height
+        return height
 
     def setGeometry(self, rect):
         super().setGeometry(rect)
+        if rect == self._laid_out_rect:
+            return
         self._do_layout(rect, False)
+        self._laid_out_rect = QRect(rect)
 
     def sizeHint(self):
         return self.minimumSize()
@@ -59,30 +88,43 @@ class FlowLayout(QLayout):
         size += QSize(2 * margin, 2 * margin)
         return size
 
+    def _item_metrics(self):
+        if self._metrics is None:
+            spacing = self.spacing()
+            metrics = []
+            for item in self._item_list:
+                style = item.widget().style()
+                space_x = spacing + style.layoutSpacing(
+                    QSizePolicy.PushButton, QSizePolicy.PushButton, Qt.Horizontal
+                )
+                space_y = spacing + style.layoutSpacing(
+                    QSizePolicy.PushButton, QSizePolicy.PushButton, Qt.Vertical
+                )
+                metrics.append((item, item.sizeHint(), space_x, space_y))
+            self._metrics = metrics
+        return self._metrics
+
     def _do_layout(self, rect, test_only):
+        with tracing.span("flow_layout", "layout", items=len(self._item_list), test_only=test_only):
+            return self._place_items(rect, test_only)
+
+    def _place_items(self, rect, test_only):
         x = rect.x()
         y = rect.y()
         line_height = 0
 
-        for item in self._item_list:
-            wid = item.widget()
-            space_x = self.spacing() + wid.style().layoutSpacing(
-                QSizePolicy.PushButton, QSizePolicy.PushButton, Qt.Horizontal
-            )
-            space_y = self.spacing() + wid.style().layoutSpacing(
-                QSizePolicy.PushButton, QSizePolicy.PushButton, Qt.Vertical
-            )
-            next_x = x + item.sizeHint().width() + space_x
+        for item, hint, space_x, space_y in self._item_metrics():
+            next_x = x + hint.width() + space_x
             if next_x - space_x > rect.right() and line_height > 0:
                 x = rect.x()
                 y = y + line_height + space_y
-                next_x = x + item.sizeHint().width() + space_x
+                next_x = x + hint.width() + space_x
                 line_height = 0
 
             if not test_only:
-                item.setGeometry(QRect(QPoint(x, y), item.sizeHint()))
+                item.setGeometry(QRect(QPoint(x, y), hint))
 
             x = next_x
-            line_height = max(line_height, item.sizeHint().height())
+            line_height = max(line_height, hint.height())
 
         return y + line_height - rect.y()
@@ -1,14 +1,16 @@
-import sys
+import logging
 
 from PySide6.QtWidgets import QWidget, QPushButton, QLabel, QGridLayout, QMessageBox
 from PySide6.QtCore import Slot, Signal, Qt
 from PySide6.QtGui import QPixmap
 
 from ..services.auth import google_auth
-from ..services import api_client
+from ..services import api_client, session
 from ..services.auth import credentials
 from .. import config
 
+logger = logging.getLogger(__name__)
+
 
 class LoginWindow(QWidget):
     login_successful = Signal()
@@ -58,10 +60,11 @@ class LoginWindow(QWidget):
             token_data = {"id_token": fb_id_token, "refresh_token": fb_refresh}
             api_client.authenticate_user(fb_id_token)
             credentials.store_credentials(token_data)
-            print("User authenticated and credentials stored.")
+            session.claim_session(fb_id_token)
+            logger.info("User authenticated and credentials stored.")
             self.login_successful.emit()
             self.close()
         except Exception as e:
-            print(f"An error occurred: {e}")
+            logger.exception("Login failed")
             error_message = f"An error occurred during login: {e}"
             QMessageBox.critical(self, "Login Failed", error_message)
@@ -1,34 +1,167 @@
 from PySide6.QtWidgets import (
+    QFileDialog,
     QMainWindow,
     QLabel,
     QWidget,
     QVBoxLayout,
     QGridLayout,
+    QLineEdit,
+    QMenu,
+    QProgressBar,
     QPushButton,
     QScrollArea,
     QSizePolicy,
     QSpacerItem,
+    QStackedWidget,
     QStatusBar,
+    QToolButton,
 )
-from PySide6.QtCore import Qt, Slot
-from PySide6.QtGui import QIcon
+from PySide6.QtCore import QThreadPool, QTimer, Qt, Slot
+from PySide6.QtGui import QAction, QIcon, QKeySequence, QShortcut
 
 import datetime as _dt
-from collections import defaultdict
-from typing import Any, Iterable, Mapping
+import time
+from typing import Any, Mapping
+from .. import tracing
+from ..models.tag_filter import get_tag_index, record_tag_ids
+from ..models.worklog_index import WorklogIndex, index_entries, parse_record_date
 from ..services import api_client
-from .login_window import LoginWindow
+from ..services.export import ExportJob
+from ..services.local_store import get_store
+from ..services.markdown_render import get_markdown_renderer
+from ..services.mutation_queue import MutationJournal, MutationQueue
+from ..services.search_index import SearchController, get_search_index
+from ..services.sync_engine import SyncEngine
+from ..services.workers import FetchPipeline, Worker
 from .worklog_card import WorklogCard
 from .day_card import DayCard
 from .flow_layout import FlowLayout
+from .trace_panel import TracePanel
+from .worklog_list_view import WorklogListView
+
+
+# Start loading the next page when the scrollbar is this close to the end.
+SCROLL_PREFETCH_PX = 200
+
+# Months with more logs than this use the virtualized list instead of cards.
+VIRTUAL_VIEW_THRESHOLD = 150
+
+# Detached cards kept for reuse across months instead of being destroyed.
+CARD_POOL_SIZE = 64
+DAY_CARD_POOL_SIZE = 8
+
+# Estimated memory for parsed months; least recently viewed ones go first.
+MONTH_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Idle time after a render before the neighbouring months are prefetched.
+PREFETCH_IDLE_MS = 500
+
+# A month fetched this recently is shown without refetching it.
+MONTH_FRESH_S = 60
+
+
+def _fetch_month_page(token, month: _dt.date, offset: int, *, sign_out=None, progress=None):
+    """Worker task: stream one page of ``month`` into the local store.
+
+    Each parsed batch is stored, its Markdown prerendered and, if
+    ``progress`` is given, reported as ``(month, offset, batch)`` so the
+    window can render it right away.
+    Returns ``(month, offset, count)`` so the window can tell stale and
+    partial results apart.
+    """
+    start, end = api_client.month_range(month)
+    store = get_store()
+    journal = MutationJournal(store)
+    count = 0
+    seen: list[str] = []
+    for batch in api_client.stream_worklog_page(
+        token, start=start, end=end, offset=offset, sign_out=sign_out
+    ):
+        count += len(batch)
+        batch = journal.overlay(batch)
+        store.upsert_worklogs(batch)
+        _feed_indexes(batch)
+        get_markdown_renderer().render_many(batch)
+        seen.extend(str(rec.get("id")) for rec in batch)
+        if progress is not None:
+            progress((month, offset, batch))
+    if offset == 0 and count < api_client.DEFAULT_PAGE_SIZE:
+        # The whole month fit in one page, so drop anything deleted upstream.
+        # Logs with pending writes stay: an edit may have moved one into
+        # this month before the server knows about it.
+        keep = seen + list(journal.pending_all())
+        _feed_indexes([], store.prune_worklogs_between(start, end, keep))
+    return month, offset, count
+
+
+def _prefetch_months(token, months, *, sign_out=None):
+    """Worker task: refresh and parse ``months`` ahead of navigation.
+
+    Returns ``[(month, entries, count)]``; ``count`` is the size of the
+    fetched first page, or ``None`` if only the cache could be read.
+    """
+    store = get_store()
+    result = []
+    for month in months:
+        count = None
+        if token:
+            try:
+                count = _fetch_month_page(token, month, 0, sign_out=sign_out)[2]
+            except Exception:
+                # Best effort: the month is fetched again when it is shown.
+                pass
+        entries = index_entries(store.worklogs_between(*api_client.month_range(month)))
+        if len(entries) <= VIRTUAL_VIEW_THRESHOLD:
+            # Shown as cards; bigger months render only their visible rows.
+            get_markdown_renderer().render_many(entry.record for entry in entries)
+        result.append((month, entries, count))
+    return result
+
+
+def _add_months(month: _dt.date, delta: int) -> _dt.date:
+    index = month.year * 12 + month.month - 1 + delta
+    return _dt.date(index // 12, index % 12 + 1, 1)
+
+
+def _feed_indexes(changed, deleted_ids=()):
+    """Keep the search and tag indexes in step with the store."""
+    for index in (get_search_index(), get_tag_index()):
+        index.add(changed)
+        index.remove(deleted_ids)
+
+
+def _index_cached_logs(token=None, *, sign_out=None):
+    """Worker task: index every cached worklog and refresh the tag list."""
+    store = get_store()
+    for batch in store.iter_worklogs():
+        _feed_indexes(batch)
+    if token:
+        store.upsert_tags(api_client.get_tags(token, sign_out=sign_out))
 
 
 class MainWindow(QMainWindow):
     def __init__(self, token_manager):
         super().__init__()
         self.token_manager = token_manager
+        self._store = get_store()
         self._current_month: _dt.date | None = None
         self._logs: list[Mapping[str, Any]] = []
+        self._index = WorklogIndex(max_bytes=MONTH_CACHE_MAX_BYTES)
+        # (year, month) -> (monotonic time, first page size) of its last fetch.
+        self._fresh_months: dict[tuple[int, int], tuple[float, int]] = {}
+        # Bumped on every local or synced change, to spot stale prefetches.
+        self._change_serial = 0
+        self._prefetch_serial = 0
+        self._day_cards: dict[_dt.date, DayCard] = {}
+        self._card_pool: list[WorklogCard] = []
+        self._day_card_pool: list[DayCard] = []
+        self._next_offset = 0
+        self._has_more = False
+        # Ids matching the active search, or None when not searching.
+        self._search_ids: set[str] | None = None
+        self._tag_include: set[str] = set()
+        self._tag_exclude: set[str] = set()
+        self._export_job: ExportJob | None = None
 
         self.setWindowTitle("Worklog")
         self.setMinimumSize(1024, 768)
@@ -63,8 +196,28 @@ class MainWindow(QMainWindow):
             QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum), 0, 4
         )
 
+        # Search box, shown with Ctrl+F
+        self._search_edit = QLineEdit()
+        self._search_edit.setPlaceholderText("Search")
+        self._search_edit.setClearButtonEnabled(True)
+        self._search_edit.setMaximumWidth(240)
+        self._search_edit.hide()
+        header_layout.addWidget(self._search_edit, 0, 5)
+
+        # Tag include/exclude filter
+        self._tag_btn = QToolButton()
+        self._tag_btn.setText("Tags")
+        self._tag_btn.setPopupMode(QToolButton.InstantPopup)
+        self._tag_menu = QMenu(self._tag_btn)
+        self._tag_menu.aboutToShow.connect(self._populate_tag_menu)
+        self._tag_btn.setMenu(self._tag_menu)
+        header_layout.addWidget(self._tag_btn, 0, 6)
+
         # Right-aligned logout button
-        header_layout.addWidget(logout_btn, 0, 5)
+        header_layout.addWidget(logout_btn, 0, 7)
+
+        QShortcut(QKeySequence.Find, self, activated=self._on_find)
+        QShortcut(QKeySequence(Qt.Key_Escape), self._search_edit, activated=self._close_search)
 
 
         # Main content area
@@ -74,126 +227,579 @@ class MainWindow(QMainWindow):
         self.main_content_layout = FlowLayout(self.main_content, 10, 10)
         self.main_content.setLayout(self.main_content_layout)
         self.scroll_area.setWidget(self.main_content)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+
+        self.list_view = WorklogListView()
+        self.list_view.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+
+        self.content_stack = QStackedWidget()
+        self.content_stack.addWidget(self.scroll_area)
+        self.content_stack.addWidget(self.list_view)
 
         # Main layout
         main_layout = QVBoxLayout()
         main_layout.addWidget(header)
-        main_layout.addWidget(self.scroll_area)
+        main_layout.addWidget(self.content_stack)
 
         central_widget = QWidget()
         central_widget.setLayout(main_layout)
         self.setCentralWidget(central_widget)
 
+        file_menu = self.menuBar().addMenu("&File")
+        self._export_action = QAction("&Export…", self)
+        self._export_action.triggered.connect(self._on_export)
+        file_menu.addAction(self._export_action)
+        export_trace_action = QAction("Export &performance trace…", self)
+        export_trace_action.triggered.connect(self._on_export_trace)
+        file_menu.addAction(export_trace_action)
+
         self.setStatusBar(QStatusBar(self))
+        self._busy_indicator = QProgressBar()
+        self._busy_indicator.setRange(0, 0)
+        self._busy_indicator.setMaximumWidth(120)
+        self._busy_indicator.hide()
+        self.statusBar().addPermanentWidget(self._busy_indicator)
+        self._pending_label = QLabel()
+        self._pending_label.hide()
+        self.statusBar().addPermanentWidget(self._pending_label)
+        self._cancel_export_btn = QPushButton("Cancel export")
+        self._cancel_export_btn.hide()
+        self.statusBar().addPermanentWidget(self._cancel_export_btn)
+        self._trace_panel = TracePanel()
+        self.statusBar().addPermanentWidget(self._trace_panel)
+        QShortcut(QKeySequence(Qt.Key_F12), self, activated=self._trace_panel.toggle)
+
+        self._fetcher = FetchPipeline(self)
+        self._fetcher.started.connect(self._on_fetch_started)
+        self._fetcher.progress.connect(self._on_fetch_progress)
+        self._fetcher.finished.connect(self._on_logs_fetched)
+        self._fetcher.failed.connect(self._on_fetch_failed)
+        self._fetcher.auth_failed.connect(self.on_logout)
+        self._fetcher.busy_changed.connect(self._busy_indicator.setVisible)
+
+        self._prefetcher = FetchPipeline(self)
+        self._prefetcher.finished.connect(self._on_prefetched)
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(PREFETCH_IDLE_MS)
+        self._prefetch_timer.timeout.connect(self._prefetch_adjacent)
+
+        self._sync = SyncEngine(token_manager, self)
+        self._sync.worklogs_changed.connect(self._on_worklogs_changed)
+        self._sync.auth_failed.connect(self.on_logout)
+
+        self._search = SearchController(parent=self)
+        self._search.results_ready.connect(self._on_search_results)
+        self._search.cleared.connect(self._on_search_cleared)
+        self._search_edit.textChanged.connect(self._search.set_query)
+
+        self._mutations = MutationQueue(token_manager, parent=self)
+        self._mutations.applied.connect(self._on_mutation_applied)
+        self._mutations.failed.connect(self._on_mutation_failed)
+        # Worklog id -> record as it was before the first unacknowledged edit.
+        self._optimistic: dict[str, Mapping[str, Any]] = {}
+        self._mutations.auth_failed.connect(self.on_logout)
+        self._mutations.pending_changed.connect(self._on_pending_changed)
+        self._on_pending_changed(self._mutations.journal.count())
+
+        # Paint the newest cached month right away; network work waits for
+        # the credentials and the first paint.
+        self._current_month = self._get_newest_month()
+        self._build_grid()
+        if token_manager.is_ready():
+            QTimer.singleShot(0, self._start_background)
+        else:
+            token_manager.ready.connect(self._start_background)
 
+    @Slot()
+    def _start_background(self):
+        """Update the cached view from the network and start syncing."""
         self.refresh()
+        self._sync.start()
+        # Send edits queued while offline or before the last exit.
+        self._mutations.flush()
+        QThreadPool.globalInstance().start(
+            Worker(0, _index_cached_logs, self.token_manager.get_token())
+        )
 
     @Slot()
     def on_logout(self):
-        self.token_manager.clear_token()
-        self.login_window = LoginWindow(self.token_manager)
-        self.login_window.show()
-        self.close()
+        # login_required wipes the local data and swaps this window for the
+        # login window; closeEvent stops the background work.
+        self.token_manager.sign_out()
 
     def refresh(self):
-        self.statusBar().showMessage("Refreshing worklogs...")
+        """Fetch the first page of the visible month in the background."""
+        if self._current_month is None:
+            self._current_month = self._get_newest_month()
+        self._fetch_page(0, "Refreshing worklogs...")
+
+    def _fetch_page(self, offset: int, message: str):
         token = self.token_manager.get_token()
         if not token:
             return
-        try:
-            logs = api_client.get_worklogs(token, sign_out=self.on_logout) or []
-        except Exception as e:
-            self.statusBar().showMessage(f"Error refreshing worklogs: {e}", 5000)
+        self._fetcher.submit(
+            _fetch_month_page,
+            token,
+            self._current_month,
+            offset,
+            message=message,
+            pass_progress=True,
+        )
+
+    def _load_more(self):
+        if self._has_more and not self._fetcher.busy:
+            self._fetch_page(self._next_offset, "Loading more worklogs...")
+
+    @Slot(int)
+    def _on_scrolled(self, value: int):
+        bar = self._active_scroll_bar()
+        if value >= bar.maximum() - SCROLL_PREFETCH_PX:
+            self._load_more()
+
+    @Slot(str)
+    def _on_fetch_started(self, message: str):
+        if message:
+            self.statusBar().showMessage(message)
+
+    @Slot(object)
+    def _on_fetch_progress(self, result):
+        """Show a batch as soon as it is parsed, before the page completes."""
+        month, _offset, batch = result
+        if month != self._current_month:
             return
+        touched = self._index.apply_changes(batch, [])
+        if (month.year, month.month) in touched:
+            self._build_grid()
+
+    @Slot(object)
+    def _on_fetch_failed(self, error: Exception):
+        self.statusBar().showMessage(
+            f"Offline, showing cached worklogs ({error})", 5000
+        )
 
-        if not isinstance(logs, Iterable):
+    @Slot(object)
+    def _on_logs_fetched(self, result):
+        month, offset, count = result
+        self._index.drop_month(month.year, month.month)
+        if month != self._current_month:
             return
+        if offset == 0:
+            self._fresh_months[(month.year, month.month)] = (time.monotonic(), count)
+        self._next_offset = offset + count
+        self._has_more = count >= api_client.DEFAULT_PAGE_SIZE
 
-        self._logs = list(logs)
+        self._build_grid()
 
-        if self._current_month is None:
-            self._current_month = self._get_newest_month(self._logs)
+        # Keep paging until the viewport is filled, since no scroll will happen.
+        if self._has_more and self._active_scroll_bar().maximum() == 0:
+            self._load_more()
+
+    def edit_worklog(self, worklog_id, *, content, record_time, tag_id=None):
+        """Apply an edit locally right away and queue it for the server."""
+        worklog_id = str(worklog_id)
+        original = self._snapshot(worklog_id)
+        if original is None:
+            return
+        updated = {**original, "content": content, "record_time": record_time}
+        if tag_id:
+            updated["tag_id"] = tag_id
+        self._store.upsert_worklogs([updated])
+        _feed_indexes([updated])
+        self._apply_local([updated], [])
+        self._mutations.enqueue_update(
+            worklog_id, content=content, record_time=record_time, tag_id=tag_id
+        )
+
+    def delete_worklog(self, worklog_id):
+        """Remove a worklog locally right away and queue the DELETE."""
+        worklog_id = str(worklog_id)
+        if self._snapshot(worklog_id) is None:
+            return
+        self._store.delete_worklogs([worklog_id])
+        _feed_indexes([], [worklog_id])
+        self._apply_local([], [worklog_id])
+        self._mutations.enqueue_delete(worklog_id)
+
+    def _snapshot(self, worklog_id):
+        """Return the current record, remembering it for rollback."""
+        entry = self._index.get(worklog_id)
+        current = dict(entry.record) if entry is not None else None
+        if current is not None and worklog_id not in self._optimistic:
+            self._optimistic[worklog_id] = current
+        return current
+
+    def _apply_local(self, changed, deleted_ids):
+        """Patch the affected card in place when possible, else reconcile."""
+        self._change_serial += 1
+        if len(changed) == 1 and not deleted_ids and self.content_stack.currentWidget() is self.scroll_area:
+            rec = changed[0]
+            old = self._index.get(rec.get("id"))
+            self._index.apply_changes(changed, [])
+            new = self._index.get(rec.get("id"))
+            day_card = self._day_cards.get(new.date) if new is not None else None
+            card = day_card.cards.get(new.id) if day_card is not None else None
+            if card is not None and old is not None and old.date == new.date:
+                card.set_worklog(rec)
+                return
+            self._build_grid()
+            return
+        self._on_worklogs_changed(changed, deleted_ids)
+
+    @Slot(str, str, bool)
+    def _on_mutation_applied(self, worklog_id, op, settled):
+        # A newer edit is still queued: keep the copy in case it is rejected.
+        if settled:
+            self._optimistic.pop(worklog_id, None)
+
+    @Slot(str, str, str, bool)
+    def _on_mutation_failed(self, worklog_id, op, message, settled):
+        # While a newer edit is queued, reverting would hide it; it may still apply.
+        original = self._optimistic.pop(worklog_id, None) if settled else None
+        if original is not None:
+            self._store.upsert_worklogs([original])
+            _feed_indexes([original])
+            self._on_worklogs_changed([original], [])
+            self.statusBar().showMessage(
+                f"Could not {op} worklog, change reverted: {message}", 5000
+            )
+        else:
+            self.statusBar().showMessage(f"Could not {op} worklog: {message}", 5000)
+
+    @Slot(int)
+    def _on_pending_changed(self, count):
+        self._pending_label.setText(f"{count} change{'s' if count != 1 else ''} not yet synced")
+        self._pending_label.setVisible(count > 0)
+
+    @Slot(list, list)
+    def _on_worklogs_changed(self, changed, deleted_ids):
+        """Rebuild only when a synced change touches the visible month."""
+        self._change_serial += 1
+        _feed_indexes(changed, deleted_ids)
+        self._search.rerun()
+        touched = self._index.apply_changes(changed, deleted_ids)
+        month = self._current_month
+        if month is not None and (month.year, month.month) in touched:
+            self._build_grid()
+
+    def _get_newest_month(self) -> _dt.date:
+        """Return the first day of the newest month in the local store.
+
+        Falls back to the current month when there are no logs.
+        """
+        newest = parse_record_date(self._store.newest_record_time())
+        return (newest or _dt.date.today()).replace(day=1)
+
+    def _month_groups(self, month: _dt.date):
+        """Return day → records for ``month``, reading the store only once."""
+        if not self._index.has_month(month.year, month.month):
+            self._index.replace_month(
+                month.year,
+                month.month,
+                self._store.worklogs_between(*api_client.month_range(month)),
+            )
+        return self._index.month(month.year, month.month)
+
+    @Slot()
+    def _prefetch_adjacent(self):
+        """Load the months either side of the visible one while idle."""
+        if self._current_month is None or self._fetcher.busy:
+            # A running fetch ends in a rebuild, which re-arms the timer.
+            return
+        months = [
+            m
+            for m in (_add_months(self._current_month, -1), _add_months(self._current_month, 1))
+            if not (self._index.has_month(m.year, m.month) and self._is_fresh(m))
+        ]
+        if not months:
+            return
+        self._prefetch_serial = self._change_serial
+        self._prefetcher.submit(_prefetch_months, self.token_manager.get_token(), months)
+
+    @Slot(object)
+    def _on_prefetched(self, result):
+        if self._prefetch_serial != self._change_serial:
+            # Changes arrived meanwhile and may be missing from the snapshot.
+            self._prefetch_timer.start()
+            return
+        for month, entries, count in result:
+            key = (month.year, month.month)
+            self._index.install_month(month.year, month.month, entries)
+            if count is not None:
+                self._fresh_months[key] = (time.monotonic(), count)
+            if month == self._current_month:
+                self._build_grid()
 
+    def _is_fresh(self, month: _dt.date) -> bool:
+        fetched = self._fresh_months.get((month.year, month.month))
+        return fetched is not None and time.monotonic() - fetched[0] < MONTH_FRESH_S
+
+    def _active_scroll_bar(self):
+        return self.content_stack.currentWidget().verticalScrollBar()
+
+    @Slot()
+    def _on_export(self):
+        if self._export_job is not None:
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export worklogs",
+            "worklogs.xlsx",
+            "Excel (*.xlsx);;CSV (*.csv);;JSON (*.json);;JSON lines (*.ndjson)",
+        )
+        if not path:
+            return
+        job = ExportJob(path, self.token_manager.get_token(), self._export_filter(), self)
+        job.progress.connect(
+            lambda n: self.statusBar().showMessage(f"Exporting… {n} worklogs")
+        )
+        job.finished.connect(self._on_export_finished)
+        job.failed.connect(self._on_export_failed)
+        job.cancelled.connect(self._on_export_cancelled)
+        self._cancel_export_btn.clicked.connect(job.cancel)
+        self._cancel_export_btn.show()
+        self._export_action.setEnabled(False)
+        self._export_job = job
+        job.start()
+
+    @Slot()
+    def _on_export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export performance trace", "worklog-trace.json", "Chrome trace (*.json)"
+        )
+        if not path:
+            return
+        try:
+            tracing.get_tracer().export_chrome_trace(path)
+        except OSError as e:
+            self.statusBar().showMessage(f"Could not export trace: {e}", 5000)
+            return
+        self.statusBar().showMessage(f"Trace written to {path}", 5000)
+
+    def _export_filter(self):
+        """Return a predicate for the active search and tag filters, if any."""
+        search_ids = frozenset(self._search_ids) if self._search_ids is not None else None
+        include = frozenset(self._tag_include)
+        exclude = frozenset(self._tag_exclude)
+        if search_ids is None and not include and not exclude:
+            return None
+
+        def keep(rec):
+            if search_ids is not None and str(rec.get("id")) not in search_ids:
+                return False
+            tags = set(record_tag_ids(rec))
+            return (not include or bool(tags & include)) and not tags & exclude
+
+        return keep
+
+    def _end_export(self):
+        self._cancel_export_btn.hide()
+        self._cancel_export_btn.clicked.disconnect()
+        self._export_action.setEnabled(True)
+        self._export_job.deleteLater()
+        self._export_job = None
+
+    @Slot(str, int)
+    def _on_export_finished(self, path, count):
+        self._end_export()
+        self.statusBar().showMessage(f"Exported {count} worklogs to {path}", 5000)
+
+    @Slot(str)
+    def _on_export_failed(self, message):
+        self._end_export()
+        self.statusBar().showMessage(f"Export failed: {message}", 5000)
+
+    @Slot()
+    def _on_export_cancelled(self):
+        self._end_export()
+        self.statusBar().showMessage("Export cancelled", 3000)
+
+    @Slot()
+    def _on_find(self):
+        self._search_edit.show()
+        self._search_edit.setFocus()
+        self._search_edit.selectAll()
+
+    @Slot()
+    def _close_search(self):
+        self._search_edit.clear()
+        self._search_edit.hide()
+
+    @Slot(str, list)
+    def _on_search_results(self, query, ids):
+        self._search_ids = set(ids)
         self._build_grid()
+        # The grid only shows the current month; the index covers them all.
+        self.statusBar().showMessage(
+            f"{len(self._logs)} matching worklogs this month, {len(ids)} in all months", 3000
+        )
 
-    def _get_newest_month(self, logs: Iterable[Mapping[str, Any]]) -> _dt.date:
-        newest: _dt.date | None = None
-        for rec in logs:
-            rt = rec.get("record_time")
-            if not rt:
-                continue
-            s = str(rt)
-            try:
-                dt = _dt.datetime.fromisoformat(s.replace("Z", "+00:00"))
-            except Exception:
-                try:
-                    dt = _dt.datetime.fromisoformat(s[:19])
-                except Exception:
-                    continue
-            d = dt.date()
-            if newest is None or d > newest:
-                newest = d
-        if newest is None:
-            newest = _dt.date.today()
-        return newest.replace(day=1)
+    @Slot()
+    def _on_search_cleared(self):
+        if self._search_ids is not None:
+            self._search_ids = None
+            self._build_grid()
+
+    @Slot()
+    def _populate_tag_menu(self):
+        self._tag_menu.clear()
+        names = {str(tag["id"]): tag.get("name") or str(tag["id"]) for tag in self._store.tags()}
+        tag_ids = sorted(set(names) | set(get_tag_index().tag_ids()), key=lambda t: names.get(t, t))
+        if not tag_ids:
+            self._tag_menu.addAction("No tags").setEnabled(False)
+            return
+        for title, selected in (("Include", self._tag_include), ("Exclude", self._tag_exclude)):
+            self._tag_menu.addSection(title)
+            for tag_id in tag_ids:
+                action = self._tag_menu.addAction(names.get(tag_id, tag_id))
+                action.setCheckable(True)
+                action.setChecked(tag_id in selected)
+                action.toggled.connect(
+                    lambda checked, t=tag_id, s=selected: self._toggle_tag(s, t, checked)
+                )
+
+    def _toggle_tag(self, selected: set, tag_id: str, checked: bool):
+        if checked:
+            selected.add(tag_id)
+        else:
+            selected.discard(tag_id)
+        active = len(self._tag_include) + len(self._tag_exclude)
+        self._tag_btn.setText(f"Tags ({active})" if active else "Tags")
+        self._build_grid()
+
+    def _filter_groups(self, groups):
+        """Narrow day groups to the active search results and tag filter.
+
+        The month, the search hits and the tag filter are each a bitmap, so
+        combining them is a couple of bitwise operations.
+        """
+        if self._search_ids is None and not self._tag_include and not self._tag_exclude:
+            return groups
+        tags = get_tag_index()
+        bits = tags.bits_for_records(
+            entry.record for entries in groups.values() for entry in entries
+        )
+        if self._search_ids is not None:
+            bits &= tags.bits_for_ids(self._search_ids)
+        bits = tags.filter_bits(self._tag_include, self._tag_exclude, within=bits)
+        ids = tags.ids_for_bits(bits)
+        return {d: [e for e in entries if e.id in ids] for d, entries in groups.items()}
 
     def _build_grid(self):
-        groups: dict[_dt.date, list[Mapping[str, Any]]] = defaultdict(list)
-        for rec in self._logs:
-            rt = rec.get("record_time")
-            if rt:
-                s = str(rt)
-                try:
-                    dt = _dt.datetime.fromisoformat(s.replace("Z", "+00:00"))
-                    d = dt.date()
-                except Exception:
-                    try:
-                        d = _dt.date.fromisoformat(s[:10])
-                    except Exception:
-                        d = _dt.date.today()
+        with tracing.span("build_grid", "ui") as fields:
+            groups = self._month_groups(self._current_month) if self._current_month else {}
+            groups = self._filter_groups(groups)
+            self._logs = [entry.record for entries in groups.values() for entry in entries]
+            fields["logs"] = len(self._logs)
+
+            if len(self._logs) > VIRTUAL_VIEW_THRESHOLD:
+                self._clear_cards()
+                self.list_view.set_groups(groups)
+                self.content_stack.setCurrentWidget(self.list_view)
             else:
-                d = _dt.date.today()
-
-            if (
-                self._current_month
-                and d.year == self._current_month.year
-                and d.month == self._current_month.month
-            ):
-                groups[d].append(rec)
-
-        # Clear existing widgets
-        while self.main_content_layout.count():
-            child = self.main_content_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        for d in sorted(groups.keys(), reverse=True):
-            day_card = DayCard(d.strftime('%A, %B %d, %Y'))
-            for log in groups[d]:
-                card = WorklogCard(log)
-                day_card.add_worklog_card(card)
-            self.main_content_layout.addWidget(day_card)
-
-        self._month_lbl.setText(
-            self._current_month.strftime("%B %Y")
-            if self._current_month
-            else "No date"
-        )
-        self.statusBar().clearMessage()
+                self.list_view.set_groups({})
+                self._build_cards(groups)
+                self.content_stack.setCurrentWidget(self.scroll_area)
+
+            self._month_lbl.setText(
+                self._current_month.strftime("%B %Y")
+                if self._current_month
+                else "No date"
+            )
+            self.statusBar().clearMessage()
+
+            if self._current_month is not None:
+                self._index.set_pinned(
+                    (m.year, m.month)
+                    for m in (_add_months(self._current_month, d) for d in (-1, 0, 1))
+                )
+                self._prefetch_timer.start()
+
+        tracing.gauge("ui.day_cards", len(self._day_cards))
+        tracing.gauge("ui.cards", sum(len(d.cards) for d in self._day_cards.values()))
+        tracing.gauge("ui.pooled_cards", len(self._card_pool) + len(self._day_card_pool))
+
+    def _clear_cards(self):
+        for day_card in self._day_cards.values():
+            self.main_content_layout.removeWidget(day_card)
+            self._release_day_card(day_card)
+        self._day_cards = {}
+
+    def _build_cards(self, groups):
+        """Reconcile the day cards with ``groups`` instead of rebuilding them.
+
+        Cards are keyed by day and worklog id, so only added, removed or
+        edited logs cost widget work.
+        """
+        days = [d for d in sorted(groups.keys(), reverse=True) if groups[d]]
+        wanted = set(days)
+        for d in [d for d in self._day_cards if d not in wanted]:
+            day_card = self._day_cards.pop(d)
+            self.main_content_layout.removeWidget(day_card)
+            self._release_day_card(day_card)
+
+        for pos, d in enumerate(days):
+            day_card = self._day_cards.get(d)
+            if day_card is None:
+                day_card = self._acquire_day_card(d.strftime('%A, %B %d, %Y'))
+                self._day_cards[d] = day_card
+            day_card.reconcile(
+                [entry.record for entry in groups[d]],
+                self._acquire_card,
+                self._release_card,
+            )
+            if self.main_content_layout.indexOf(day_card) != pos:
+                self.main_content_layout.removeWidget(day_card)
+                self.main_content_layout.insertWidget(pos, day_card)
+            day_card.show()
+
+    def _acquire_card(self, worklog) -> WorklogCard:
+        if self._card_pool:
+            card = self._card_pool.pop()
+            card.set_worklog(worklog)
+            return card
+        return WorklogCard(worklog)
+
+    def _release_card(self, card: WorklogCard):
+        card.hide()
+        card.setParent(None)
+        if len(self._card_pool) < CARD_POOL_SIZE:
+            self._card_pool.append(card)
+        else:
+            card.deleteLater()
+
+    def _acquire_day_card(self, date_str: str) -> DayCard:
+        if self._day_card_pool:
+            day_card = self._day_card_pool.pop()
+            day_card.set_date(date_str)
+            return day_card
+        return DayCard(date_str)
+
+    def _release_day_card(self, day_card: DayCard):
+        day_card.release_all(self._release_card)
+        day_card.hide()
+        day_card.setParent(None)
+        if len(self._day_card_pool) < DAY_CARD_POOL_SIZE:
+            self._day_card_pool.append(day_card)
+        else:
+            day_card.deleteLater()
 
     def _shift_month(self, delta: int):
         if self._current_month is None:
-            self._current_month = _dt.date.today().replace(day=1)
-        month = self._current_month.month + delta
-        year = self._current_month.year
-        while month < 1:
-            month += 12
-            year -= 1
-        while month > 12:
-            month -= 12
-            year += 1
-        self._current_month = _dt.date(year, month, 1)
+            self._current_month = self._get_newest_month()
+        self._current_month = _add_months(self._current_month, delta)
+        self._has_more = False
         self._build_grid()
+        if self._is_fresh(self._current_month):
+            fetched = self._fresh_months[(self._current_month.year, self._current_month.month)]
+            # Prefetched while idle: show it as is and page on from there.
+            self._fetcher.cancel()
+            self._next_offset = fetched[1]
+            self._has_more = fetched[1] >= api_client.DEFAULT_PAGE_SIZE
+            if self._has_more and self._active_scroll_bar().maximum() == 0:
+                self._load_more()
+            return
+        self.refresh()
 
     @Slot()
     def _on_prev_month(self):
@@ -202,3 +808,13 @@ class MainWindow(QMainWindow):
     @Slot()
     def _on_next_month(self):
         self._shift_month(1)
+
+    def closeEvent(self, event):
+        if self._export_job is not None:
+            self._export_job.cancel()
+        self._fetcher.cancel()
+        self._prefetch_timer.stop()
+        self._prefetcher.cancel()
+        self._sync.stop()
+        self._mutations.stop()
+        super().closeEvent(event)
@@ -0,0 +1,61 @@
+from PySide6.QtCore import QTimer, Slot
+from PySide6.QtWidgets import QLabel
+
+from .. import tracing
+
+# How often the panel re-reads the tracer while visible.
+REFRESH_MS = 500
+
+
+def _format_bytes(count: float) -> str:
+    if count >= 1024 * 1024:
+        return f"{count / (1024 * 1024):.1f} MB"
+    if count >= 1024:
+        return f"{count / 1024:.0f} KB"
+    return f"{int(count)} B"
+
+
+class TracePanel(QLabel):
+    """Status-bar summary of recent spans, split by category.
+
+    Polls the tracer on a timer only while shown, so it costs nothing when
+    hidden and never receives calls from worker threads.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("TracePanel")
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+        self.hide()
+
+    @Slot()
+    def toggle(self):
+        self.setVisible(not self.isVisible())
+
+    def showEvent(self, event):
+        self.refresh()
+        self._timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    @Slot()
+    def refresh(self):
+        tracer = tracing.get_tracer()
+        parts = []
+        for cat, stats in sorted(tracer.recent().items()):
+            text = f"{cat} {int(stats['count'])}× {stats['ms']:.0f} ms (max {stats['max_ms']:.0f})"
+            if stats["bytes"]:
+                text += f" {_format_bytes(stats['bytes'])}"
+            parts.append(text)
+        counters = tracer.counters()
+        parts.append(
+            f"cards {int(counters.get('ui.cards', 0))}"
+            f" / days {int(counters.get('ui.day_cards', 0))}"
+            f" / pooled {int(counters.get('ui.pooled_cards', 0))}"
+        )
+        self.setText(f"Last {tracing.SUMMARY_WINDOW_S:.0f} s: " + " · ".join(parts))
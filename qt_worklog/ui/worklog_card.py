@@ -1,9 +1,70 @@
 from PySide6.QtWidgets import (
+    QSizePolicy,
     QWidget,
     QVBoxLayout,
-    QLabel,
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtGui import QAbstractTextDocumentLayout, QColor, QPainter, QPalette
+
+from ..services.markdown_render import DEFAULT_WIDTH_PX, RenderedText, get_markdown_renderer
+
+# Mirrors the QLabel text colour from style.qss.
+_TEXT = QColor("#ffffff")
+
+
+def draw_rendered(painter: QPainter, rendered: RenderedText, color: QColor = _TEXT) -> None:
+    """Paint a cached document at the painter's origin."""
+    context = QAbstractTextDocumentLayout.PaintContext()
+    context.palette.setColor(QPalette.Text, color)
+    rendered.document.documentLayout().draw(painter, context)
+
+
+class MarkdownView(QWidget):
+    """Shows a worklog's Markdown from the shared render cache.
+
+    Its height for a width comes from the cached layout, so neither a
+    rebuild nor a relayout parses or wraps the text again.
+    """
+
+    def __init__(self, worklog, parent=None):
+        super().__init__(parent)
+        self._renderer = get_markdown_renderer()
+        self._worklog = worklog
+        policy = QSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
+        policy.setHeightForWidth(True)
+        self.setSizePolicy(policy)
+
+    def set_worklog(self, worklog) -> None:
+        old = self._worklog
+        self._worklog = worklog
+        if old.get("id") != worklog.get("id") or old.get("content") != worklog.get("content"):
+            self.updateGeometry()
+            self.update()
+
+    def _rendered(self, width: int | None = None) -> RenderedText:
+        if width is None:
+            width = self.width() if self.testAttribute(Qt.WA_Resized) else DEFAULT_WIDTH_PX
+        return self._renderer.get(self._worklog, width)
+
+    def hasHeightForWidth(self) -> bool:
+        return True
+
+    def heightForWidth(self, width: int) -> int:
+        return self._rendered(width).height
+
+    def sizeHint(self) -> QSize:
+        rendered = self._rendered()
+        return QSize(rendered.width, rendered.height)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._renderer.preferred_width = self._renderer.bucket(event.size().width())
+        if self._rendered().height != event.size().height():
+            self.updateGeometry()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        draw_rendered(painter, self._rendered())
 
 
 class WorklogCard(QWidget):
@@ -15,11 +76,14 @@ class WorklogCard(QWidget):
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(5)
 
-        content_label = QLabel(worklog.get("content", "No content"))
-        content_label.setWordWrap(True)
-        layout.addWidget(content_label)
+        self.content_view = MarkdownView(worklog)
+        layout.addWidget(self.content_view)
 
         self.setLayout(layout)
         self.setObjectName("WorklogCard")
         self.setAttribute(Qt.WA_StyledBackground, True)
 
+    def set_worklog(self, worklog):
+        """Show ``worklog``, repainting only if its text changed."""
+        self.worklog = worklog
+        self.content_view.set_worklog(worklog)
@@ -0,0 +1,121 @@
+from PySide6.QtCore import QModelIndex, QRect, QSize, Qt
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen
+from PySide6.QtWidgets import QListView, QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+from ..models.log_model import LogModel
+from ..services.markdown_render import get_markdown_renderer
+from .worklog_card import draw_rendered
+
+# Mirrors the DayCard/WorklogCard look from style.qss.
+_CARD_BORDER = QColor("#505050")
+_HEADER_BG = QColor("#505050")
+_TEXT = QColor("#ffffff")
+_PADDING = 10
+_SPACING = 10
+_RADIUS = 5
+
+
+class WorklogDelegate(QStyledItemDelegate):
+    """Paints day headers and worklog cards straight onto the view.
+
+    Row heights are cached per row key for the current viewport width,
+    because wrapping text is the expensive part of a layout pass. Log
+    text is Markdown, drawn from the shared render cache.
+    """
+
+    def __init__(self, view: QListView):
+        super().__init__(view)
+        self._view = view
+        self._renderer = get_markdown_renderer()
+        self._heights: dict[str, int] = {}
+        self._cache_width = -1
+
+    def clear_cache(self) -> None:
+        self._heights.clear()
+
+    def _text_width(self) -> int:
+        return max(1, self._view.viewport().width() - 4 * _PADDING)
+
+    def _font(self, option: QStyleOptionViewItem, kind: int) -> QFont:
+        font = QFont(option.font)
+        if kind == LogModel.HEADER:
+            font.setBold(True)
+        return font
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        width = self._text_width()
+        if width != self._cache_width:
+            self._heights.clear()
+            self._cache_width = width
+        key = index.data(LogModel.KeyRole)
+        height = self._heights.get(key)
+        if height is None:
+            kind = index.data(LogModel.KindRole)
+            if kind == LogModel.LOG:
+                text_height = self._renderer.get(index.data(LogModel.RecordRole), width).height
+            else:
+                metrics = QFontMetrics(self._font(option, kind))
+                text_height = metrics.boundingRect(
+                    QRect(0, 0, width, 1_000_000),
+                    int(Qt.TextWordWrap),
+                    index.data(Qt.DisplayRole) or "",
+                ).height()
+            height = text_height + 2 * _PADDING
+            if kind == LogModel.HEADER:
+                height += _SPACING
+            self._heights[key] = height
+        # The view's spacing surrounds every item; text is already wrapped to fit.
+        return QSize(max(0, self._view.viewport().width() - 2 * self._view.spacing()), height)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        kind = index.data(LogModel.KindRole)
+        rect = option.rect.adjusted(_PADDING, 0, -_PADDING, 0)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(self._font(option, kind))
+        if kind == LogModel.HEADER:
+            rect = rect.adjusted(0, _SPACING, 0, 0)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(_HEADER_BG)
+            painter.drawRoundedRect(rect, _RADIUS, _RADIUS)
+        else:
+            pen = QPen(_CARD_BORDER)
+            if option.state & QStyle.State_Selected:
+                pen.setColor(option.palette.highlight().color())
+            painter.setPen(pen)
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRoundedRect(rect.adjusted(0, 1, -1, -1), _RADIUS, _RADIUS)
+        text_rect = rect.adjusted(_PADDING, _PADDING, -_PADDING, -_PADDING)
+        if kind == LogModel.LOG:
+            rendered = self._renderer.get(index.data(LogModel.RecordRole), self._text_width())
+            painter.setClipRect(text_rect)
+            painter.translate(text_rect.topLeft())
+            draw_rendered(painter, rendered, _TEXT)
+        else:
+            painter.setPen(_TEXT)
+            painter.drawText(text_rect, int(Qt.TextWordWrap), index.data(Qt.DisplayRole) or "")
+        painter.restore()
+
+
+class WorklogListView(QListView):
+    """Virtualized month view: only rows in the viewport are painted."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.log_model = LogModel(self)
+        self.delegate = WorklogDelegate(self)
+        self.setModel(self.log_model)
+        self.setItemDelegate(self.delegate)
+        self.setUniformItemSizes(False)
+        self.setResizeMode(QListView.Adjust)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(100)
+        self.setVerticalScrollMode(QListView.ScrollPerPixel)
+        # Rows always fit the viewport width.
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QListView.SingleSelection)
+        self.setObjectName("WorklogListView")
+        self.log_model.modelAboutToBeReset.connect(self.delegate.clear_cache)
+
+    def set_groups(self, groups) -> None:
+        self.log_model.set_groups(groups)
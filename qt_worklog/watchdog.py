@@ -0,0 +1,132 @@
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, QTimer, Slot
+
+from . import tracing
+
+logger = logging.getLogger(__name__)
+
+# GUI-thread heartbeat period.
+HEARTBEAT_MS = 100
+# A heartbeat this much later than due counts as a stall.
+STALL_THRESHOLD_MS = 250
+# Upper bounds of the stall histogram buckets, in milliseconds.
+HISTOGRAM_BOUNDS_MS = (500, 1000, 2000, 5000, 10000)
+
+
+class StallWatchdog(QObject):
+    """Detects event-loop stalls and logs what the GUI thread was doing.
+
+    A ``QTimer`` on the GUI thread stamps a heartbeat; a daemon thread
+    checks it. When the heartbeat is overdue by more than the threshold,
+    the GUI thread's Python stack is captured from ``sys._current_frames``
+    while it is still stuck, and logged once the stall ends together with
+    its duration. Stall lengths are kept in a histogram for :meth:`stop`.
+    """
+
+    def __init__(
+        self,
+        parent: QObject | None = None,
+        *,
+        heartbeat_ms: int = HEARTBEAT_MS,
+        threshold_ms: int = STALL_THRESHOLD_MS,
+    ):
+        super().__init__(parent)
+        self.heartbeat_ms = heartbeat_ms
+        self.threshold_ms = threshold_ms
+        self._gui_thread = threading.get_ident()
+        self._lock = threading.Lock()
+        self._last_beat = time.monotonic()
+        self._stack: Optional[List[str]] = None
+        self._histogram: Dict[str, int] = {self._bucket(b): 0 for b in HISTOGRAM_BOUNDS_MS}
+        self._histogram[self._bucket(None)] = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(heartbeat_ms)
+        self._timer.timeout.connect(self._beat)
+
+    @staticmethod
+    def _bucket(bound_ms: Optional[int]) -> str:
+        return f"<{bound_ms} ms" if bound_ms is not None else f">={HISTOGRAM_BOUNDS_MS[-1]} ms"
+
+    def start(self) -> None:
+        """Start watching; call from the GUI thread."""
+        if self._thread is not None:
+            return
+        self._gui_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._timer.start()
+        self._thread = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching and log the stall histogram."""
+        self._timer.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+        self.dump_histogram()
+
+    def histogram(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._histogram)
+
+    def dump_histogram(self) -> None:
+        counts = self.histogram()
+        if not any(counts.values()):
+            logger.info("No event-loop stalls recorded.")
+            return
+        logger.info(
+            "Event-loop stalls: %s",
+            ", ".join(f"{bucket}: {n}" for bucket, n in counts.items()),
+        )
+
+    @Slot()
+    def _beat(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            gap_ms = (now - self._last_beat) * 1000 - self.heartbeat_ms
+            self._last_beat = now
+            stack, self._stack = self._stack, None
+        if gap_ms >= self.threshold_ms:
+            self._record(gap_ms, stack)
+
+    def _record(self, stall_ms: float, stack: Optional[List[str]]) -> None:
+        with self._lock:
+            for bound in HISTOGRAM_BOUNDS_MS:
+                if stall_ms < bound:
+                    self._histogram[self._bucket(bound)] += 1
+                    break
+            else:
+                self._histogram[self._bucket(None)] += 1
+        tracing.count("ui.stalls")
+        logger.warning(
+            "Event loop stalled for %.0f ms%s",
+            stall_ms,
+            ", GUI thread was at:\n" + "".join(stack) if stack else "",
+        )
+
+    def _watch(self) -> None:
+        interval = self.heartbeat_ms / 2000
+        while not self._stop.wait(interval):
+            with self._lock:
+                overdue_ms = (time.monotonic() - self._last_beat) * 1000 - self.heartbeat_ms
+                captured = self._stack is not None
+            if overdue_ms < self.threshold_ms or captured:
+                continue
+            frame = sys._current_frames().get(self._gui_thread)
+            if frame is None:
+                continue
+            stack = traceback.format_stack(frame)
+            with self._lock:
+                # Keep it only if the GUI thread is still stuck in this stall.
+                if (time.monotonic() - self._last_beat) * 1000 - self.heartbeat_ms >= self.threshold_ms:
+                    self._stack = stack
@@ -0,0 +1,17 @@
+import os
+import tempfile
+
+import pytest
+
+# Headless and isolated: set before Qt or qt_worklog are imported.
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+_TMP = tempfile.TemporaryDirectory(prefix="worklog-tests-")
+for _name in ("XDG_DATA_HOME", "XDG_CACHE_HOME", "XDG_STATE_HOME"):
+    os.environ[_name] = os.path.join(_TMP.name, _name.lower())
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
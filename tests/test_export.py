@@ -0,0 +1,87 @@
+import csv
+import json
+import threading
+import zipfile
+from xml.etree import ElementTree
+
+import pytest
+
+from qt_worklog.services.export import COLUMNS, ExportCancelled, export_worklogs, format_for_path
+
+_NS = {"m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+RECORDS = [
+    {
+        "id": "1",
+        "record_time": "2024-05-01T09:00:00Z",
+        "content": 'Quotes " and commas, <tags> & "ampersands"\nsecond line',
+        "tags": [{"id": "t1"}, {"id": "t2"}],
+        "space_id": "s1",
+        "created_at": "2024-05-01T09:00:00Z",
+        "updated_at": None,
+    },
+    {"id": "2", "record_time": "2024-05-02T09:00:00Z", "content": "ctrl\x01\x08char\ttab 日本語"},
+]
+
+
+def _export(tmp_path, name, pages=(RECORDS[:1], RECORDS[1:])):
+    path = tmp_path / name
+    assert export_worklogs(path, pages) == len(RECORDS)
+    return path
+
+
+def _sheet_rows(path):
+    with zipfile.ZipFile(path) as zf:
+        assert {"[Content_Types].xml", "xl/workbook.xml"} <= set(zf.namelist())
+        root = ElementTree.fromstring(zf.read("xl/worksheets/sheet1.xml"))
+    return [
+        [cell.findtext("m:is/m:t", default="", namespaces=_NS) for cell in row.findall("m:c", _NS)]
+        for row in root.iterfind("m:sheetData/m:row", _NS)
+    ]
+
+
+def test_csv_round_trip(tmp_path):
+    path = _export(tmp_path, "out.csv")
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == COLUMNS
+    assert rows[1] == ["1", RECORDS[0]["record_time"], RECORDS[0]["content"], "t1, t2", "s1", RECORDS[0]["created_at"], ""]
+    assert rows[2][2] == RECORDS[1]["content"]
+
+
+@pytest.mark.parametrize("name", ["out.ndjson", "out.jsonl"])
+def test_ndjson_round_trip(tmp_path, name):
+    path = _export(tmp_path, name)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == RECORDS
+
+
+def test_json_is_one_array(tmp_path):
+    assert json.loads(_export(tmp_path, "out.json").read_text(encoding="utf-8")) == RECORDS
+
+
+def test_empty_json_is_an_empty_array(tmp_path):
+    path = tmp_path / "empty.json"
+    assert export_worklogs(path, [[]]) == 0
+    assert json.loads(path.read_text(encoding="utf-8")) == []
+
+
+def test_xlsx_round_trip_escapes_and_strips_control_characters(tmp_path):
+    rows = _sheet_rows(_export(tmp_path, "out.xlsx"))
+    assert rows[0] == COLUMNS
+    assert rows[1][2] == RECORDS[0]["content"]
+    assert rows[1][3] == "t1, t2"
+    assert rows[2][2] == "ctrlchar\ttab 日本語"
+
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(ValueError):
+        format_for_path(tmp_path / "out.txt")
+
+
+def test_cancelled_export_leaves_nothing_behind(tmp_path):
+    cancelled = threading.Event()
+    cancelled.set()
+    with pytest.raises(ExportCancelled):
+        export_worklogs(tmp_path / "out.json", [RECORDS], cancelled=cancelled)
+    assert list(tmp_path.iterdir()) == []
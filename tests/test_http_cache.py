@@ -0,0 +1,164 @@
+import base64
+import json
+import os
+
+import pytest
+
+from benchmarks.stub_server import StubApiServer
+from qt_worklog.services import api_client
+from qt_worklog.services.http_cache import ResponseCache, set_response_cache
+
+LOGS = [{"id": str(i), "record_time": f"2024-05-{i:02d}T09:00:00Z", "content": "x" * 40} for i in range(1, 8)]
+
+
+def _token(user_id: str) -> str:
+    def part(obj):
+        return base64.urlsafe_b64encode(json.dumps(obj).encode()).decode().rstrip("=")
+
+    return f"{part({'alg': 'none'})}.{part({'user_id': user_id})}.sig"
+
+
+TOKEN = _token("alice")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(tmp_path)
+    set_response_cache(cache)
+    yield cache
+    set_response_cache(None)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with StubApiServer(LOGS, etag=True) as server:
+        monkeypatch.setattr(api_client, "API_URL", server.url)
+        yield server
+
+
+def _entries(cache):
+    return sorted(cache.directory.glob("*.entry"))
+
+
+def _get():
+    return api_client.get_worklog_page(TOKEN)
+
+
+def _stream():
+    return [rec for batch in api_client.stream_worklog_page(TOKEN, batch_size=3) for rec in batch]
+
+
+def _restart(cache):
+    """A new cache over the same directory, as after an app restart."""
+    fresh = ResponseCache(cache.directory)
+    set_response_cache(fresh)
+    return fresh
+
+
+def _spy(calls, method):
+    def wrapper(*args, **kwargs):
+        calls.append(method.__name__)
+        return method(*args, **kwargs)
+
+    return wrapper
+
+
+def _lose_entry_after_validators(monkeypatch, cache):
+    # The entry disappears between sending the validators and the 304.
+    validators = cache.validators
+
+    def then_discard(key):
+        headers = validators(key)
+        cache.discard(key)
+        return headers
+
+    monkeypatch.setattr(cache, "validators", then_discard)
+
+
+@pytest.mark.parametrize("fetch", [_get, _stream])
+def test_200_is_stored(cache, server, fetch):
+    assert fetch() == LOGS
+    [entry] = _entries(cache)
+    header, body = entry.read_bytes().split(b"\n", 1)
+    assert json.loads(header)["etag"] == server.etag
+    assert json.loads(body) == LOGS
+
+
+def test_304_is_served_from_memory(cache, server, monkeypatch):
+    api_client.get_worklogs(TOKEN)
+    first = api_client.get_worklogs(TOKEN)
+    assert api_client.get_worklogs(TOKEN) is first
+    _get()
+    monkeypatch.setattr(cache, "open_body", lambda key: pytest.fail("read from disk"))
+    assert _stream() == LOGS
+    assert server.requests == 5
+
+
+@pytest.mark.parametrize("fetch", [_get, _stream])
+def test_304_after_restart_is_served_from_disk(cache, server, monkeypatch, fetch):
+    _get()
+    fresh = _restart(cache)
+    read = []
+    for name in ("load", "open_body"):
+        monkeypatch.setattr(fresh, name, _spy(read, getattr(fresh, name)))
+    assert fetch() == LOGS
+    assert server.requests == 2
+    assert read
+
+
+@pytest.mark.parametrize("fetch", [_get, _stream])
+def test_304_without_the_entry_refetches_in_full(cache, server, monkeypatch, fetch):
+    _get()
+    fresh = _restart(cache)
+    _lose_entry_after_validators(monkeypatch, fresh)
+    assert fetch() == LOGS
+    # Conditional request, then the unconditional retry.
+    assert server.requests == 3
+    assert len(_entries(fresh)) == 1
+
+
+@pytest.mark.parametrize("fetch", [_get, _stream])
+def test_response_without_validators_is_discarded(cache, server, fetch):
+    _get()
+    server.set_worklogs(LOGS[:2], etag=False)
+    assert fetch() == LOGS[:2]
+    assert _entries(cache) == []
+    assert cache.validators(_key(cache)) == {}
+
+
+def test_cut_off_stream_aborts_the_entry(cache, server):
+    server.body = json.dumps(LOGS).encode("utf-8")[:-20]
+    server.etag = '"truncated"'
+    with pytest.raises(ValueError):
+        _stream()
+    assert list(cache.directory.iterdir()) == []
+
+
+def test_abandoned_stream_aborts_the_entry(cache, server):
+    batches = api_client.stream_worklog_page(TOKEN, batch_size=3)
+    assert next(batches) == LOGS[:3]
+    batches.close()
+    assert list(cache.directory.iterdir()) == []
+
+
+def test_disk_budget_evicts_oldest_entries(tmp_path):
+    body = json.dumps(["x" * 60]).encode("utf-8")
+    ResponseCache(tmp_path / "probe").store("a", body, None, etag='"a"')
+    entry_size = (tmp_path / "probe" / "a.entry").stat().st_size
+    cache = ResponseCache(tmp_path / "http", disk_max_bytes=3 * entry_size + entry_size // 2)
+    for age, key in enumerate(["c", "b", "a"]):
+        cache.store(key, body, ["x" * 60], etag=f'"{key}"')
+        mtime = 1_000_000 + age * 100
+        os.utime(cache._path(key), (mtime, mtime))
+    assert [p.stem for p in _entries(cache)] == ["a", "b", "c"]
+
+    cache.store("d", body, ["x" * 60], etag='"d"')
+    assert [p.stem for p in _entries(cache)] == ["a", "b", "d"]
+    assert cache.peek("c") is None
+    assert cache.peek("d") == ["x" * 60]
+    assert cache._disk_bytes == sum(p.stat().st_size for p in _entries(cache))
+
+
+def _key(cache):
+    params = api_client._page_params(None, None, api_client.DEFAULT_PAGE_SIZE, 0, {})
+    return api_client._cache_key(cache, f"{api_client.API_URL}/worklogs", params, TOKEN)
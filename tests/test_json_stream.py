@@ -0,0 +1,67 @@
+import io
+import json
+
+import pytest
+
+from qt_worklog.services.json_stream import iter_file_chunks, iter_json_array
+
+PAYLOAD = (
+    ' \n[ {"id": "1", "content": "say \\"hi\\" \\\\ \\/ \\n", "tags": [{"id": "t1"}, []]},\n'
+    '\t{"emoji": "\\ud83d\\ude00 \\u00e9", "raw": "日本語 😀", "nested": {"a": [1, [2, {"b": null}]]}},'
+    ' 12345, -0.5e10, true, false, null, "plain", [], {} ] \r\n'
+).encode("utf-8")
+
+
+def _collect(chunks, batch_size=2):
+    return [value for batch in iter_json_array(chunks, batch_size) for value in batch]
+
+
+def test_whole_payload():
+    assert _collect([PAYLOAD]) == json.loads(PAYLOAD)
+
+
+def test_split_at_every_byte_boundary():
+    expected = json.loads(PAYLOAD)
+    for cut in range(len(PAYLOAD) + 1):
+        assert _collect([PAYLOAD[:cut], PAYLOAD[cut:]]) == expected, cut
+
+
+def test_one_byte_at_a_time():
+    assert _collect(PAYLOAD[i : i + 1] for i in range(len(PAYLOAD))) == json.loads(PAYLOAD)
+
+
+def test_batches_are_bounded():
+    batches = list(iter_json_array([b"[1, 2, 3, 4, 5]"], batch_size=2))
+    assert batches == [[1, 2], [3, 4], [5]]
+
+
+def test_empty_array():
+    assert list(iter_json_array([b"[", b" ]"])) == []
+
+
+def test_file_chunks():
+    assert _collect(iter_file_chunks(io.BytesIO(PAYLOAD), chunk_size=7)) == json.loads(PAYLOAD)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"",
+        b"[",
+        b'[{"id": 1}',
+        b'[{"id": 1},',
+        b'[{"id": "unterminated',
+        b"[1 2]",
+        b"[1,,2]",
+        b"[1,]",
+        b"[,1]",
+        b'{"id": 1}',
+        b"[1] 2",
+        b"[tru]",
+        b'["\\ud83d"',
+    ],
+)
+def test_malformed_or_truncated_input_raises(payload):
+    for cut in range(len(payload) + 1):
+        with pytest.raises(ValueError):
+            _collect([payload[:cut], payload[cut:]])
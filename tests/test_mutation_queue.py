@@ -0,0 +1,168 @@
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from qt_worklog.services import mutation_queue
+from qt_worklog.services.local_store import WorklogStore
+from qt_worklog.services.mutation_queue import (
+    APPLIED,
+    AUTH,
+    BACKOFF_BASE_S,
+    DELETE,
+    FAILED,
+    RETRY,
+    UPDATE,
+    MutationJournal,
+    flush_due,
+)
+
+
+def _rejected(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} Client Error", response=response)
+
+
+@pytest.fixture
+def journal():
+    store = WorklogStore(Path(":memory:"))
+    yield MutationJournal(store)
+    store.close()
+
+
+def test_edits_coalesce_into_one_row(journal):
+    journal.enqueue_update("1", {"content": "a", "record_time": "2024-05-01"})
+    journal.enqueue_update("1", {"content": "b"})
+    assert journal.count() == 1
+    assert journal.pending("1") == (UPDATE, {"content": "b", "record_time": "2024-05-01"})
+    [(_id, _op, _payload, version, attempts)] = journal.due(time.time())
+    assert (version, attempts) == (2, 0)
+
+
+def test_delete_replaces_edit_and_wins_over_later_edits(journal):
+    journal.enqueue_update("1", {"content": "a"})
+    journal.enqueue_delete("1")
+    assert journal.pending("1") == (DELETE, None)
+    journal.enqueue_update("1", {"content": "b"})
+    assert journal.pending("1") == (DELETE, None)
+
+
+def test_overlay_applies_pending_writes(journal):
+    journal.enqueue_update("1", {"content": "local"})
+    journal.enqueue_delete("2")
+    records = [{"id": "1", "content": "server"}, {"id": "2"}, {"id": "3"}]
+    assert journal.overlay(records) == [{"id": "1", "content": "local"}, {"id": "3"}]
+
+
+def test_complete_is_guarded_by_version(journal):
+    journal.enqueue_update("1", {"content": "a"})
+    journal.enqueue_update("1", {"content": "b"})
+    assert not journal.complete("1", 1)
+    assert journal.pending("1") == (UPDATE, {"content": "b"})
+    assert journal.complete("1", 2)
+    assert journal.pending("1") is None
+
+
+def test_reschedule_backs_off(journal):
+    journal.enqueue_update("1", {"content": "a"})
+    before = time.time()
+    journal.reschedule("1", 1, attempts=2)
+    assert journal.due(before) == []
+    [(_id, _op, _payload, _version, attempts)] = journal.due(float("inf"))
+    assert attempts == 3
+    delay = journal.next_due_at() - before
+    assert BACKOFF_BASE_S * 4 * 0.5 <= delay <= BACKOFF_BASE_S * 4 * 1.5 + 1
+
+
+def test_reschedule_skips_a_superseded_version(journal):
+    journal.enqueue_update("1", {"content": "a"})
+    journal.enqueue_update("1", {"content": "b"})
+    journal.reschedule("1", 1, attempts=0)
+    assert journal.next_due_at() == 0
+
+
+@pytest.mark.parametrize(
+    "op, error, status",
+    [
+        (UPDATE, requests.ConnectionError(), RETRY),
+        (UPDATE, requests.Timeout(), RETRY),
+        (UPDATE, _rejected(500), RETRY),
+        (UPDATE, _rejected(429), RETRY),
+        (UPDATE, _rejected(401), AUTH),
+        (DELETE, _rejected(403), AUTH),
+        (DELETE, _rejected(404), APPLIED),
+        (UPDATE, _rejected(404), FAILED),
+        (UPDATE, _rejected(422), FAILED),
+        (UPDATE, ValueError("bad payload"), FAILED),
+    ],
+)
+def test_classify(op, error, status):
+    assert mutation_queue._classify(op, error) == status
+
+
+def test_edit_edit_apply_fail(journal, monkeypatch):
+    """Edit 2 queued while edit 1 is in flight; edit 1 applies, edit 2 is rejected."""
+    journal.enqueue_update("1", {"content": "edit 1"})
+    sent = []
+
+    def send_second_edit_races(token, op, worklog_id, payload, sign_out):
+        sent.append(payload["content"])
+        journal.enqueue_update("1", {"content": "edit 2"})
+
+    monkeypatch.setattr(mutation_queue, "_send", send_second_edit_races)
+    assert flush_due("token", journal) == [("1", "update", APPLIED, "", False)]
+    assert journal.pending("1") == ("update", {"content": "edit 2"})
+
+    def reject(token, op, worklog_id, payload, sign_out):
+        sent.append(payload["content"])
+        raise _rejected(422)
+
+    monkeypatch.setattr(mutation_queue, "_send", reject)
+    [(worklog_id, op, status, _message, settled)] = flush_due("token", journal)
+    assert (worklog_id, op, status, settled) == ("1", "update", FAILED, True)
+    assert journal.pending("1") is None
+    assert sent == ["edit 1", "edit 2"]
+
+
+def test_window_reverts_to_confirmed_original(monkeypatch):
+    from qt_worklog.ui import main_window
+    from qt_worklog.ui.main_window import MainWindow
+
+    monkeypatch.setattr(main_window, "_feed_indexes", lambda *args: None)
+    restored = []
+    window = SimpleNamespace(
+        _optimistic={"1": {"id": "1", "content": "original"}},
+        _store=SimpleNamespace(upsert_worklogs=restored.extend),
+        _on_worklogs_changed=lambda changed, deleted: None,
+        statusBar=lambda: SimpleNamespace(showMessage=lambda *args: None),
+    )
+
+    MainWindow._on_mutation_applied(window, "1", "update", False)
+    assert window._optimistic == {"1": {"id": "1", "content": "original"}}
+
+    MainWindow._on_mutation_failed(window, "1", "update", "422 Client Error", True)
+    assert restored == [{"id": "1", "content": "original"}]
+    assert window._optimistic == {}
+
+
+def test_month_prune_keeps_logs_with_pending_edits(qapp, monkeypatch):
+    import datetime as _dt
+
+    from qt_worklog.services import api_client
+    from qt_worklog.ui import main_window
+
+    store = WorklogStore(Path(":memory:"))
+    monkeypatch.setattr(main_window, "get_store", lambda: store)
+    journal = MutationJournal(store)
+    moved = {"id": "2", "record_time": "2024-05-03T09:00:00Z", "content": "moved here"}
+    store.upsert_worklogs([{"id": "1", "record_time": "2024-05-01T09:00:00Z"}, moved])
+    journal.enqueue_update("2", {"record_time": moved["record_time"]})
+    # The server still has log 2 in April and no longer has log 1 at all.
+    monkeypatch.setattr(api_client, "stream_worklog_page", lambda *args, **kwargs: iter([]))
+
+    main_window._fetch_month_page("token", _dt.date(2024, 5, 1), 0)
+    assert [rec["id"] for batch in store.iter_worklogs() for rec in batch] == ["2"]
+    store.close()
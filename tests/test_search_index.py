@@ -0,0 +1,62 @@
+import pytest
+
+from qt_worklog.services.search_index import query_terms, tokenize
+
+
+def test_tokenize_lowercases_words():
+    assert tokenize("Fixed the Parser, again!") == ["fixed", "the", "parser", "again"]
+
+
+def test_tokenize_cjk_runs_into_unigrams_and_bigrams():
+    assert tokenize("修复解析器") == ["修", "复", "解", "析", "器", "修复", "复解", "解析", "析器"]
+
+
+def test_tokenize_splits_mixed_scripts():
+    assert tokenize("API接口ok") == ["api", "接", "口", "接口", "ok"]
+
+
+def test_tokenize_hangul_and_kana():
+    assert tokenize("カナ 한글") == ["カ", "ナ", "カナ", "한", "글", "한글"]
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("", ([], None)),
+        ("pars", ([], "pars")),
+        ("fix pars", (["fix"], "pars")),
+        ("Fix Parser ", (["fix", "parser"], None)),
+        ("解析器", (["解析", "析器"], None)),
+        ("解", (["解"], None)),
+        ("解析 pa", (["解析"], "pa")),
+        ("pa 解析", (["pa", "解析"], None)),
+        ("API接口", (["api", "接口"], None)),
+        ("接口api", (["接口"], "api")),
+    ],
+)
+def test_query_terms(query, expected):
+    assert query_terms(query) == expected
+
+
+def test_query_bigrams_are_indexed_terms():
+    exact, prefix = query_terms("解析器")
+    assert prefix is None
+    assert set(exact) <= set(tokenize("修复解析器的问题"))
+
+
+def test_prefix_matches_indexed_words():
+    from qt_worklog.services.search_index import SearchIndex
+
+    index = SearchIndex()
+    index.add(
+        [
+            {"id": "1", "content": "Fixed the parser"},
+            {"id": "2", "content": "Parsed 解析器 output"},
+            {"id": "3", "content": "Unrelated"},
+        ]
+    )
+    assert set(index.search("pars")) == {"1", "2"}
+    assert set(index.search("parser")) == {"1"}
+    assert set(index.search("解析")) == {"2"}
+    assert set(index.search("the pars")) == {"1"}
+    assert index.search("parsers ") == []
@@ -0,0 +1,83 @@
+import base64
+import json
+from pathlib import Path
+
+import pytest
+
+from qt_worklog.services import local_store, session
+
+
+def _token(user_id: str) -> str:
+    def part(obj):
+        return base64.urlsafe_b64encode(json.dumps(obj).encode()).decode().rstrip("=")
+
+    return f"{part({'alg': 'none'})}.{part({'user_id': user_id})}.sig"
+
+
+@pytest.fixture
+def store(qapp, monkeypatch):
+    store = local_store.WorklogStore(Path(":memory:"))
+    monkeypatch.setattr(local_store, "_store", store)
+    yield store
+    store.close()
+
+
+def test_claim_wipes_another_users_data(store):
+    session.claim_session(_token("alice"))
+    store.upsert_worklogs([{"id": "1", "record_time": "2024-05-01T09:00:00Z"}])
+    assert session.has_session_data()
+
+    session.claim_session(_token("alice"))
+    assert store.newest_record_time() is not None
+
+    session.claim_session(_token("bob"))
+    assert store.newest_record_time() is None
+    assert store.owner() == "bob"
+
+
+def test_clear_forgets_the_owner(store):
+    session.claim_session(_token("alice"))
+    store.upsert_worklogs([{"id": "1", "record_time": "2024-05-01T09:00:00Z"}])
+    session.clear_session_data()
+    assert not session.has_session_data()
+    assert store.newest_record_time() is None
+
+
+@pytest.fixture
+def token_manager(store, monkeypatch):
+    from qt_worklog.services import api_client
+    from qt_worklog.services.auth import token_manager as token_manager_module
+
+    stored = {"creds": {"id_token": _token("alice"), "refresh_token": "r"}}
+    monkeypatch.setattr(token_manager_module.credentials, "get_credentials", lambda: stored["creds"])
+    monkeypatch.setattr(
+        token_manager_module.credentials, "delete_credentials", lambda: stored.update(creds=None)
+    )
+    manager = token_manager_module.TokenManager()
+    manager._loaded = True
+    yield manager
+    api_client.set_token_refresher(None)
+
+
+def test_sign_out_asks_for_login_once(store, token_manager):
+    session.claim_session(_token("alice"))
+    asked = []
+    token_manager.login_required.connect(lambda: asked.append(True))
+
+    token_manager.sign_out()
+    token_manager.sign_out()
+    assert asked == [True]
+    assert token_manager.is_signed_out()
+    assert not session.has_session_data()
+
+
+def test_401_after_the_session_ended_does_not_sign_out_again(token_manager):
+    from types import SimpleNamespace
+
+    from qt_worklog.services import api_client
+
+    calls = []
+    api_client._handle_auth(SimpleNamespace(status_code=401), lambda: calls.append("live"))
+    token_manager.sign_out()
+    api_client._handle_auth(SimpleNamespace(status_code=401), lambda: calls.append("ended"))
+    assert calls == ["live"]
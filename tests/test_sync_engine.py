@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pytest
+
+from qt_worklog.services import api_client, sync_engine
+from qt_worklog.services.local_store import WorklogStore
+
+
+@pytest.mark.parametrize(
+    "watermark, stamps, expected",
+    [
+        ("2024-05-01T10:00:00Z", ["2024-05-01T09:59:59.999+00:00"], "2024-05-01T10:00:00Z"),
+        ("2024-05-01T10:00:00+00:00", ["2024-05-01T10:00:00.5Z"], "2024-05-01T10:00:00.5Z"),
+        ("2024-05-01T10:00:00.900Z", ["2024-05-01T10:00:00.95Z"], "2024-05-01T10:00:00.95Z"),
+        ("2024-05-01T12:00:00+02:00", ["2024-05-01T10:30:00Z"], "2024-05-01T10:30:00Z"),
+        ("2024-05-01T10:00:00", ["2024-05-01T09:00:00Z"], "2024-05-01T10:00:00"),
+        ("2024-05-01T10:00:00Z", ["garbage"], "2024-05-01T10:00:00Z"),
+        ("garbage", ["2024-05-01T10:00:00Z"], "2024-05-01T10:00:00Z"),
+    ],
+)
+def test_latest_compares_instants(watermark, stamps, expected):
+    assert sync_engine._latest(watermark, stamps) == expected
+
+
+def test_sync_keeps_the_newest_watermark(monkeypatch):
+    store = WorklogStore(Path(":memory:"))
+    store.apply_changes([], [], watermark_key=sync_engine.ALL_SPACES, watermark="2024-05-01T10:00:00.5Z")
+    page = [
+        # Sorts after the watermark as text but is half a second older.
+        {"id": "1", "record_time": "2024-05-01T09:00:00Z", "updated_at": "2024-05-01T12:00:00+02:00"},
+        {"id": "2", "deleted": True, "updated_at": "2024-05-01T10:00:00.25Z"},
+    ]
+    requested = []
+
+    def pages(token, **params):
+        requested.append(params["updated_since"])
+        return iter([page])
+
+    monkeypatch.setattr(api_client, "iter_worklog_pages", pages)
+    changed, deleted = sync_engine.sync_once("token", store)
+    assert [rec["id"] for rec in changed] == ["1"]
+    assert deleted == ["2"]
+    assert requested == ["2024-05-01T10:00:00.5Z"]
+    assert store.sync_watermark(sync_engine.ALL_SPACES) == "2024-05-01T10:00:00.5Z"
+    store.close()
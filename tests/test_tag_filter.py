@@ -0,0 +1,61 @@
+from qt_worklog.models.tag_filter import TagBitmapIndex, record_tag_ids
+
+LOGS = [
+    {"id": "1", "tag_ids": ["work", "bug"]},
+    {"id": "2", "tags": [{"id": "work"}]},
+    {"id": "3", "tag_id": "home"},
+    {"id": "4"},
+]
+
+
+def _ids(index, **kwargs):
+    return index.ids_for_bits(index.filter_bits(**kwargs))
+
+
+def test_record_tag_ids_accepts_every_shape():
+    assert [record_tag_ids(rec) for rec in LOGS] == [["work", "bug"], ["work"], ["home"], []]
+
+
+def test_include_any_or_all():
+    index = TagBitmapIndex()
+    index.add(LOGS)
+    assert _ids(index) == {"1", "2", "3", "4"}
+    assert _ids(index, include=["work", "home"]) == {"1", "2", "3"}
+    assert _ids(index, include=["work", "bug"], match_all=True) == {"1"}
+    assert _ids(index, include=["unknown"]) == set()
+
+
+def test_exclude_and_within():
+    index = TagBitmapIndex()
+    index.add(LOGS)
+    assert _ids(index, exclude=["bug", "home"]) == {"2", "4"}
+    within = index.bits_for_ids(["1", "2", "missing"])
+    assert _ids(index, include=["work"], exclude=["bug"], within=within) == {"2"}
+
+
+def test_removal_clears_bits_and_reuses_slots():
+    index = TagBitmapIndex()
+    index.add(LOGS)
+    index.remove(["1"])
+    assert len(index) == 3
+    assert _ids(index, include=["work"]) == {"2"}
+    assert "bug" not in index.tag_ids()
+    index.add([{"id": "5", "tag_ids": ["home"]}])
+    assert len(index._ids) == 4
+    assert _ids(index, include=["home"]) == {"3", "5"}
+    assert _ids(index, include=["work", "bug"]) == {"2"}
+
+
+def test_re_adding_replaces_tags():
+    index = TagBitmapIndex()
+    index.add(LOGS)
+    index.add([{"id": "2", "tag_ids": ["home"]}])
+    assert _ids(index, include=["work"]) == {"1"}
+    assert _ids(index, include=["home"]) == {"2", "3"}
+
+
+def test_bits_for_records_indexes_unknown_records():
+    index = TagBitmapIndex()
+    bits = index.bits_for_records(LOGS[:2])
+    assert index.ids_for_bits(bits) == {"1", "2"}
+    assert _ids(index, include=["bug"], within=bits) == {"1"}
@@ -0,0 +1,91 @@
+import datetime as _dt
+
+from qt_worklog.models.worklog_index import IndexedLog, WorklogIndex, parse_record_date
+
+
+def _log(worklog_id, day, content=""):
+    return {"id": worklog_id, "record_time": f"{day}T09:00:00Z", "content": content}
+
+
+def _entry_size(content=""):
+    return IndexedLog(_log("x", "2024-01-01", content), _dt.date(2024, 1, 1)).size
+
+
+def test_parse_record_date():
+    assert parse_record_date("2024-05-01T23:30:00Z") == _dt.date(2024, 5, 1)
+    assert parse_record_date("2024-05-01T23:30:00.123+02:00") == _dt.date(2024, 5, 1)
+    assert parse_record_date("2024-05-01 garbage") == _dt.date(2024, 5, 1)
+    assert parse_record_date("") is None
+    assert parse_record_date("garbage") is None
+
+
+def test_buckets_by_month_and_day():
+    index = WorklogIndex([_log("1", "2024-05-01"), _log("2", "2024-05-01"), _log("3", "2024-06-02")])
+    may = index.month(2024, 5)
+    assert [e.id for e in may[_dt.date(2024, 5, 1)]] == ["1", "2"]
+    assert index.month(2024, 7) == {}
+    assert index.newest_month() == _dt.date(2024, 6, 1)
+
+
+def test_re_adding_moves_a_record_and_keeps_sizes_exact():
+    index = WorklogIndex([_log("1", "2024-05-01", "abc"), _log("2", "2024-06-01")])
+    index.add([_log("1", "2024-06-03", "abcdef")])
+    assert index.month(2024, 5) == {}
+    assert index._month_bytes[(2024, 5)] == 0
+    assert index._month_bytes[(2024, 6)] == _entry_size() + _entry_size("abcdef")
+    assert index.size == _entry_size() + _entry_size("abcdef")
+    assert len(index) == 2
+
+
+def test_remove_updates_size_and_bounds():
+    index = WorklogIndex([_log("1", "2024-05-01", "abc"), _log("2", "2024-06-01")])
+    index.remove(["2", "missing"])
+    assert index.size == _entry_size("abc")
+    assert index.max_date == _dt.date(2024, 5, 1)
+    index.remove(["1"])
+    assert index.size == 0
+    assert index.max_date is None
+
+
+def test_reading_a_month_marks_it_recently_used():
+    index = WorklogIndex()
+    for month in (1, 2, 3):
+        index.replace_month(2024, month, [_log(str(month), f"2024-{month:02d}-01")])
+    assert index.loaded_months() == [(2024, 1), (2024, 2), (2024, 3)]
+    index.month(2024, 1)
+    assert index.loaded_months() == [(2024, 2), (2024, 3), (2024, 1)]
+
+
+def test_lru_evicts_least_recently_used_months_first():
+    index = WorklogIndex(max_bytes=2 * _entry_size())
+    index.replace_month(2024, 1, [_log("1", "2024-01-01")])
+    index.replace_month(2024, 2, [_log("2", "2024-02-01")])
+    index.month(2024, 1)
+    index.replace_month(2024, 3, [_log("3", "2024-03-01")])
+    assert index.loaded_months() == [(2024, 1), (2024, 3)]
+    assert index.get("2") is None
+    assert index.size == 2 * _entry_size()
+
+
+def test_pinned_months_survive_eviction():
+    index = WorklogIndex(max_bytes=2 * _entry_size())
+    index.replace_month(2024, 1, [_log("1", "2024-01-01")])
+    index.replace_month(2024, 2, [_log("2", "2024-02-01")])
+    index.set_pinned({(2024, 1)})
+    index.replace_month(2024, 3, [_log("3", "2024-03-01")])
+    assert index.loaded_months() == [(2024, 1), (2024, 3)]
+
+    index.set_pinned({(2024, 1), (2024, 3)})
+    index.replace_month(2024, 4, [_log("4", "2024-04-01")])
+    assert index.has_month(2024, 1) and index.has_month(2024, 3)
+    assert not index.has_month(2024, 4)
+
+
+def test_apply_changes_only_touches_loaded_months():
+    index = WorklogIndex()
+    index.replace_month(2024, 5, [_log("1", "2024-05-01"), _log("2", "2024-05-02")])
+    touched = index.apply_changes([_log("1", "2024-04-30"), _log("3", "2024-05-03")], ["2"])
+    assert touched == {(2024, 5)}
+    assert index.get("1") is None
+    assert [e.id for day in index.month(2024, 5).values() for e in day] == ["3"]
+    assert index.size == _entry_size()